@@ -1,7 +1,8 @@
-from exam import retriever
-from web import search_adapter, movie_adapter
-from utils import network, movie_db
+from exam import retriever, query_cache, compressor
+from web import search_adapter
+from utils import network
 from brain import confidence_gate, memory
+from movie import title_matcher, resolver
 from models import local_llm, hybrid_llm
 import sys
 import os
@@ -31,11 +32,23 @@ def execute_waterfall(user_text, mode="casual", context=None, history=None):
         # 1. EXAM MODE (RAG based Isolation)
         # =====================================================
         if mode == "exam":
+            cached_answer = query_cache.get_answer(user_text)
+            if cached_answer:
+                print("[Waterfall] Exam answer served from cache.")
+                return cached_answer
+
             found_context = retriever.get_relevant_context(user_text)
 
             if not found_context:
                 return "Out of syllabus."
 
+            # Keep only the sentences that matter: less prefill on CPU
+            found_context = compressor.compress_context(
+                user_text,
+                found_context,
+                query_embedding=retriever.get_query_embedding(user_text)
+            )
+
             response = local_llm.run_inference(
                 user_text,
                 mode="exam",
@@ -49,20 +62,23 @@ def execute_waterfall(user_text, mode="casual", context=None, history=None):
                 mode="exam"
             )
 
-            return clean if status == "PASS" else "Unable to generate valid exam response."
+            if status != "PASS":
+                return "Unable to generate valid exam response."
+
+            query_cache.put_answer(user_text, clean)
+            return clean
 
         # =====================================================
         # 2. MOVIE MODE (Cinematic Narrative Logic)
         # =====================================================
         elif mode == "movie":
             # Step A: Fetch Movie Data (Local first, then Online)
-            movie_facts = movie_db.get_movie_from_db(user_text)
+            # Look up the title named in the message, not the whole sentence
+            title = title_matcher.extract_title(user_text)
+            lookup_query = title or title_matcher.strip_filler(user_text) or user_text
 
-            if not movie_facts and network.is_internet_allowed(mode="movie"):
-                tmdb_data = movie_adapter.get_online_movie(user_text)
-                if tmdb_data:
-                    movie_db.save_movie_to_db(tmdb_data)
-                    movie_facts = tmdb_data
+            # Stale rows are served at once and refreshed in the background
+            movie_facts = resolver.resolve(lookup_query)
 
             if movie_facts:
                 # Step B: Build clean structured context (No Markdown/Emojis)
@@ -86,6 +102,9 @@ def execute_waterfall(user_text, mode="casual", context=None, history=None):
                 if status == "PASS":
                     return clean
 
+                # The rejected draft must not stay in the reused KV context
+                local_llm.discard_context("movie")
+
                 # Step E: Fallback - Clean structured output if LLM fails
                 rating = movie_facts.get('rating', 'N/A')
                 return (
@@ -101,12 +120,7 @@ def execute_waterfall(user_text, mode="casual", context=None, history=None):
         # 3. CASUAL MODE (Hybrid Search + Local Brain)
         # =====================================================
         else:
-            is_realtime_query = any(
-                trigger in user_text.lower()
-                for trigger in REALTIME_TRIGGERS
-            )
-
-            if is_realtime_query:
+            if _is_realtime_query(user_text):
                 if network.is_internet_allowed(mode="casual"):
                     web_results = search_adapter.search_web(user_text)
                     if not web_results:
@@ -134,27 +148,93 @@ def execute_waterfall(user_text, mode="casual", context=None, history=None):
             if status == "PASS":
                 return clean_response
 
-            if network.is_internet_allowed(mode="casual"):
-                web_results = search_adapter.search_web(user_text)
-                if not web_results:
-                    return "Not found online."
-
-                return hybrid_llm.generate_response(
-                    user_text,
-                    web_results,
-                    history
-                )
-
-            return "Unable to answer and internet is unavailable."
+            local_llm.discard_context("casual")
+            return _web_fallback(user_text, history)
 
     except Exception as e:
         traceback.print_exc()
         return "Internal system error."
 
+
+def stream_waterfall(user_text, mode="casual", history=None, clean_fn=None):
+    """
+    Streaming counterpart of execute_waterfall.
+
+    Yields ("token", text) events while the local model generates, then one
+    ("final", text) event with the validated answer. Only the local casual
+    route streams; exam, movie and realtime queries need the full answer
+    before gating, so they emit just the final event.
+    """
+    if history is None:
+        history = []
+
+    if mode in ("exam", "movie") or _is_realtime_query(user_text):
+        yield "final", execute_waterfall(user_text, mode=mode, history=history)
+        return
+
+    print(f"\n[Waterfall] Mode: {mode} | Query: {user_text} | Streaming")
+
+    try:
+        parts = []
+
+        for delta in local_llm.stream_inference(
+            user_text,
+            mode="casual",
+            history=history,
+            clean_fn=clean_fn
+        ):
+            parts.append(delta)
+            yield "token", delta
+
+        local_response = "".join(parts)
+
+        status, clean_response = confidence_gate.validate_answer(
+            local_response,
+            user_text=user_text,
+            mode="casual"
+        )
+
+        if status == "PASS":
+            yield "final", clean_response
+            return
+
+        # Streamed draft failed the gate; the final event replaces it
+        local_llm.discard_context("casual")
+        yield "final", _web_fallback(user_text, history)
+
+    except Exception:
+        traceback.print_exc()
+        yield "final", "Internal system error."
+
 # =====================================================
 # HELPERS
 # =====================================================
 
+def _is_realtime_query(user_text):
+    """Checks whether the query needs live web data."""
+    return any(
+        trigger in user_text.lower()
+        for trigger in REALTIME_TRIGGERS
+    )
+
+
+def _web_fallback(user_text, history):
+    """
+    Answers from web search when the local model is not confident.
+    """
+    if network.is_internet_allowed(mode="casual"):
+        web_results = search_adapter.search_web(user_text)
+        if not web_results:
+            return "Not found online."
+
+        return hybrid_llm.generate_response(
+            user_text,
+            web_results,
+            history
+        )
+
+    return "Unable to answer and internet is unavailable."
+
 def _build_movie_context(data):
     """
     Converts raw movie DB data into clean structured context for LLM.
@@ -0,0 +1,125 @@
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+
+# --- CONFIGURATION ---
+K1 = 1.5
+B = 0.75
+MAX_INDEXES = 4   # Physical collections kept in memory
+
+# Keeps dotted section numbers ("3.2.1") and formula names together
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)*")
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "of", "in", "on",
+    "to", "for", "and", "or", "by", "with", "as", "at", "it", "this",
+    "that", "what", "which", "who", "how", "why", "when", "where", "does",
+    "do", "did", "explain", "define", "describe", "me", "about", "tell"
+}
+
+
+def tokenize(text):
+    return [
+        token for token in TOKEN_PATTERN.findall((text or "").lower())
+        if token not in STOPWORDS
+    ]
+
+
+class BM25Index:
+    """In-memory inverted index with Okapi BM25 scoring."""
+
+    def __init__(self, k1=K1, b=B):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(dict)   # term -> {doc_id: term frequency}
+        self.doc_lengths = {}
+        self.documents = {}
+        self.total_length = 0
+
+    def add(self, doc_id, text):
+        tokens = tokenize(text)
+        self.documents[doc_id] = text
+        self.doc_lengths[doc_id] = len(tokens)
+        self.total_length += len(tokens)
+
+        for term, freq in Counter(tokens).items():
+            self.postings[term][doc_id] = freq
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def _idf(self, term):
+        df = len(self.postings.get(term, ()))
+        n = len(self.doc_lengths)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query, k=10):
+        """
+        Returns [(doc_id, score, coverage)] best first, where coverage is
+        the share of distinct query terms found in the document.
+        """
+        terms = set(tokenize(query))
+        if not terms or not self.doc_lengths:
+            return []
+
+        avg_length = self.total_length / len(self.doc_lengths) or 1
+        scores = defaultdict(float)
+        matched = defaultdict(int)
+
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+
+            idf = self._idf(term)
+            for doc_id, freq in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] += idf * freq * (self.k1 + 1) / (freq + norm)
+                matched[doc_id] += 1
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(doc_id, score, matched[doc_id] / len(terms)) for doc_id, score in ranked]
+
+
+_INDEXES = {}
+_LOCK = threading.Lock()
+
+
+def build_index(name, collection, batch_size=500):
+    """Builds (or rebuilds) the BM25 index for a physical collection."""
+    index = BM25Index()
+    offset = 0
+
+    while True:
+        batch = collection.get(include=["documents"], limit=batch_size, offset=offset)
+        ids = batch.get("ids") or []
+        for doc_id, document in zip(ids, batch.get("documents") or []):
+            index.add(doc_id, document)
+        if len(ids) < batch_size:
+            break
+        offset += len(ids)
+
+    with _LOCK:
+        _INDEXES[name] = index
+        while len(_INDEXES) > MAX_INDEXES:
+            _INDEXES.pop(next(iter(_INDEXES)))
+
+    return index
+
+
+def get_index(name, collection):
+    """Cached index for a physical collection, built on first use."""
+    with _LOCK:
+        index = _INDEXES.get(name)
+    return index if index is not None else build_index(name, collection)
+
+
+def reciprocal_rank_fusion(rankings, k=60):
+    """Fuses several ranked id lists; returns ids best first."""
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] += 1.0 / (k + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)
@@ -0,0 +1,126 @@
+import math
+import re
+
+from exam import bm25, embeddings
+
+
+# --- CONFIGURATION ---
+TOKEN_BUDGET = 250          # Approximate prompt tokens allowed for context
+CHARS_PER_TOKEN = 4         # Rough English average, good enough for budgeting
+DUPLICATE_JACCARD = 0.8     # Token overlap above which sentences are duplicates
+CHUNK_SEPARATOR = "\n\n---\n\n"
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text):
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+def _is_duplicate(tokens, text, kept):
+    """
+    Overlapping chunks repeat sentences, often cut mid-way at the chunk
+    edge, so containment counts as a duplicate too.
+    """
+    for other_tokens, other_text in kept:
+        if text in other_text or other_text in text:
+            return True
+        union = tokens | other_tokens
+        if union and len(tokens & other_tokens) / len(union) >= DUPLICATE_JACCARD:
+            return True
+    return False
+
+
+def _cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _lexical_score(query_terms, tokens):
+    if not query_terms:
+        return 0.0
+    return len(query_terms & tokens) / len(query_terms)
+
+
+def compress_context(question, context, query_embedding=None, budget=TOKEN_BUDGET):
+    """
+    Keeps only the sentences most relevant to the question, within a token
+    budget, and drops near-duplicates from overlapping chunks.
+
+    Sentences are scored against `query_embedding` when retrieval already
+    computed one (sentence vectors come through the embedding cache);
+    otherwise, e.g. after a BM25 fast path, by query-term overlap so the
+    model is never loaded just for compression.
+    Selected sentences keep their original order.
+    """
+    if not context or estimate_tokens(context) <= budget:
+        return context
+
+    # -----------------------------
+    # Split + Deduplicate
+    # -----------------------------
+    sentences = []   # (chunk_no, text, tokens)
+    kept = []
+
+    for chunk_no, chunk in enumerate(context.split(CHUNK_SEPARATOR)):
+        for sentence in SENTENCE_SPLIT.split(chunk.strip()):
+            sentence = sentence.strip()
+            if len(sentence) < 3:
+                continue
+
+            normalized = sentence.lower()
+            tokens = set(bm25.tokenize(sentence))
+            if _is_duplicate(tokens, normalized, kept):
+                continue
+
+            kept.append((tokens, normalized))
+            sentences.append((chunk_no, sentence, tokens))
+
+    if not sentences:
+        return context
+
+    # -----------------------------
+    # Score
+    # -----------------------------
+    if query_embedding is not None:
+        vectors = embeddings.embed_texts([text for _, text, _ in sentences])
+        scores = [_cosine(query_embedding, vector) for vector in vectors]
+    else:
+        query_terms = set(bm25.tokenize(question))
+        scores = [_lexical_score(query_terms, tokens) for _, _, tokens in sentences]
+
+    # -----------------------------
+    # Select Under Budget
+    # -----------------------------
+    selected = set()
+    used = 0
+    separator_cost = estimate_tokens(CHUNK_SEPARATOR)
+
+    for i in sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True):
+        # Every sentence after the first is joined with at most a chunk separator
+        cost = estimate_tokens(sentences[i][1]) + (separator_cost if selected else 0)
+        if used + cost > budget:
+            continue
+        selected.add(i)
+        used += cost
+
+    if not selected:
+        # Always keep the single best sentence, even if it alone is over budget
+        selected.add(max(range(len(sentences)), key=lambda i: scores[i]))
+
+    # -----------------------------
+    # Rebuild In Original Order
+    # -----------------------------
+    groups = {}
+    for i in sorted(selected):
+        chunk_no, text, _ = sentences[i]
+        groups.setdefault(chunk_no, []).append(text)
+
+    compressed = CHUNK_SEPARATOR.join(" ".join(texts) for texts in groups.values())
+
+    print(
+        f"[Compressor] Context {estimate_tokens(context)} -> "
+        f"{estimate_tokens(compressed)} tokens."
+    )
+    return compressed
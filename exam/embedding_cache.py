@@ -0,0 +1,167 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+
+
+# --- CONFIGURATION ---
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Lives outside vector_store so it survives /reset-exam-db
+CACHE_PATH = os.path.join(CURRENT_DIR, "embedding_cache.sqlite3")
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+EVICT_TO_RATIO = 0.9   # Evict down to this share of the limit
+TOUCH_BATCH = 1024     # Cache hits whose last_used is written together
+TOUCH_INTERVAL = 300   # Seconds before pending hits are written anyway
+
+
+def cache_key(model_name, text):
+    """Content hash + model name, so a model change never returns stale vectors."""
+    return hashlib.sha1(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent (content hash, model) -> float32 vector store.
+
+    Least recently used rows are evicted once the stored vectors exceed
+    `max_bytes`. Reads only select: the last_used of cache hits is kept in
+    memory and written in batches (or before eviction), so a query never
+    writes to SQLite just to record a hit.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=MAX_CACHE_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._lock = threading.Lock()
+        self._touched = {}   # key -> last_used not yet written
+        self._touched_since = time.monotonic()
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL;")
+            self._conn.execute("PRAGMA synchronous=NORMAL;")
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    vector BLOB,
+                    size INTEGER,
+                    last_used REAL
+                )
+            ''')
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_last_used ON embeddings(last_used);"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get_many(self, model_name, texts):
+        """Returns {index: vector} for the texts already cached."""
+        keys = [cache_key(model_name, text) for text in texts]
+        found = {}
+
+        with self._lock:
+            conn = self._connection()
+
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                part = keys[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(part))})",
+                    part
+                ).fetchall()
+                found.update(rows)
+
+            if found:
+                now = time.time()
+                for key in found:
+                    self._touched[key] = now
+                if len(self._touched) >= TOUCH_BATCH \
+                        or time.monotonic() - self._touched_since >= TOUCH_INTERVAL:
+                    self._flush_touches(conn)
+
+        result = {}
+        for index, key in enumerate(keys):
+            if key in found:
+                result[index] = array("f", found[key]).tolist()
+        return result
+
+    def _flush_touches(self, conn):
+        """Writes pending last_used updates (called under the lock)."""
+        if self._touched:
+            conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()]
+            )
+            conn.commit()
+            self._touched.clear()
+        self._touched_since = time.monotonic()
+
+    def put_many(self, model_name, texts, vectors):
+        now = time.time()
+        rows = []
+
+        for text, vector in zip(texts, vectors):
+            blob = array("f", [float(x) for x in vector]).tobytes()
+            rows.append((cache_key(model_name, text), model_name, blob, len(blob), now))
+
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.commit()
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Recent hits must count before picking the least recently used
+        self._flush_touches(conn)
+
+        target = int(self.max_bytes * EVICT_TO_RATIO)
+        freed = 0
+        victims = []
+
+        for key, size in conn.execute("SELECT key, size FROM embeddings ORDER BY last_used"):
+            victims.append((key,))
+            freed += size
+            if total - freed <= target:
+                break
+
+        conn.executemany("DELETE FROM embeddings WHERE key = ?", victims)
+        conn.commit()
+        print(f"[Embedding Cache] Evicted {len(victims)} vectors.")
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM embeddings")
+            conn.commit()
+            self._touched.clear()
+
+
+def cached_embed(texts, embed_fn, model_name, cache):
+    """
+    Embeds `texts` through the cache: only unseen texts reach embed_fn.
+    Returns vectors in input order.
+    """
+    texts = list(texts)
+    vectors = cache.get_many(model_name, texts)
+
+    missing = [i for i in range(len(texts)) if i not in vectors]
+    if missing:
+        fresh = embed_fn([texts[i] for i in missing])
+        cache.put_many(model_name, [texts[i] for i in missing], fresh)
+        for i, vector in zip(missing, fresh):
+            vectors[i] = [float(x) for x in vector]
+
+    return [vectors[i] for i in range(len(texts))]
@@ -0,0 +1,59 @@
+import threading
+
+from exam.embedding_cache import EmbeddingCache, cached_embed
+
+
+# --- CONFIGURATION ---
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+_EMBEDDING_FUNC = None
+_LOCK = threading.Lock()
+
+# Persistent vectors for text embedded before (see exam/embedding_cache.py)
+CACHE = EmbeddingCache()
+
+
+def get_embedding_function():
+    """
+    Returns the process-wide embedding function, loading the model on
+    first use. Indexer and retriever share this single instance.
+    """
+    global _EMBEDDING_FUNC
+
+    if _EMBEDDING_FUNC is None:
+        with _LOCK:
+            if _EMBEDDING_FUNC is None:
+                from chromadb.utils import embedding_functions
+
+                print(f"[Embeddings] Loading model '{MODEL_NAME}'...")
+                _EMBEDDING_FUNC = embedding_functions.SentenceTransformerEmbeddingFunction(
+                    model_name=MODEL_NAME
+                )
+                print("[Embeddings] Model ready.")
+
+    return _EMBEDDING_FUNC
+
+
+def is_loaded():
+    return _EMBEDDING_FUNC is not None
+
+
+def warm_up_async():
+    """Loads the model on a background thread so startup is not blocked."""
+    thread = threading.Thread(target=get_embedding_function, name="embedding-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def embed_texts(texts):
+    """
+    Embeds texts with the shared model, paying only for text that is not
+    already in the on-disk embedding cache. The model is only loaded when
+    something actually misses.
+    """
+    return cached_embed(
+        texts,
+        lambda missing: get_embedding_function()(missing),
+        MODEL_NAME,
+        CACHE
+    )
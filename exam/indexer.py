@@ -1,151 +1,319 @@
 import os
 import shutil
-import chromadb
+import hashlib
+import threading
+import time
 import re
-from chromadb.utils import embedding_functions
+from exam import embeddings, store, pdf_extract, bm25
 from pypdf import PdfReader
 
 
 # --- CONFIGURATION ---
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 UPLOAD_DIR = os.path.join(CURRENT_DIR, "uploads")
-DB_DIR = os.path.join(CURRENT_DIR, "vector_store")
+DB_DIR = store.DB_DIR
 
-EMBEDDING_FUNC = embedding_functions.SentenceTransformerEmbeddingFunction(
-    model_name="all-MiniLM-L6-v2"
-)
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 75
+EMBED_BATCH_SIZE = 64    # Chunks embedded per add() call
+COPY_BATCH_SIZE = 500    # Rows copied per get()/add() when staging
 
+# One writer at a time; queries keep using the active collection
+_INDEX_LOCK = threading.Lock()
 
-def process_pdf(filename="syllabus.pdf", collection_name="exam_syllabus"):
-    """
-    Reads PDF, chunks text safely, and refreshes the Vector DB.
-    Fully isolated collection per mode.
-    """
 
-    pdf_path = os.path.join(UPLOAD_DIR, filename)
-    print(f"[Indexer] Processing: {filename}...")
+def chunk_id(source_id, chunk):
+    """Stable chunk id: source plus a hash of the chunk text."""
+    digest = hashlib.sha1(chunk.encode("utf-8")).hexdigest()
+    return f"{source_id}:{digest}"
 
-    if not os.path.exists(pdf_path):
-        return False, "File not found on server."
 
-    # -----------------------------
-    # Read PDF
-    # -----------------------------
-    full_text = ""
+def _no_progress(**fields):
+    pass
 
-    try:
-        reader = PdfReader(pdf_path)
 
-        if reader.is_encrypted:
-            return False, "PDF is encrypted."
+def _copy_rows(source, target, where=None, ids=None):
+    """
+    Copies stored rows (with their embeddings) into the staging collection,
+    page by page. Returns the number of rows copied.
+    """
+    copied = 0
+    offset = 0
+
+    while True:
+        if ids is not None:
+            batch = source.get(ids=ids, include=["embeddings", "documents", "metadatas"])
+        else:
+            batch = source.get(
+                where=where,
+                include=["embeddings", "documents", "metadatas"],
+                limit=COPY_BATCH_SIZE,
+                offset=offset
+            )
+
+        batch_ids = batch.get("ids") or []
+        if batch_ids:
+            target.add(
+                ids=batch_ids,
+                embeddings=batch["embeddings"],
+                documents=batch["documents"],
+                metadatas=batch["metadatas"]
+            )
+            copied += len(batch_ids)
+
+        if ids is not None or len(batch_ids) < COPY_BATCH_SIZE:
+            break
+
+        offset += len(batch_ids)
+
+    return copied
+
+
+# -----------------------------
+# Streaming Pipeline Stages
+# -----------------------------
+
+def iter_page_texts(reader, progress=_no_progress, pdf_path=None, workers=None):
+    """
+    Stage 1: yields raw text page by page, in page order.
+    Extraction fans out over processes when a path is given
+    (see exam/pdf_extract.py for the worker settings).
+    """
+    for page_no, text in pdf_extract.iter_pages(reader, pdf_path=pdf_path, workers=workers):
+        progress(pages_parsed=page_no + 1)
+        if text:
+            yield text
 
-        for page in reader.pages:
-            text = page.extract_text()
-            if text:
-                full_text += text + "\n"
 
-    except Exception as e:
-        return False, f"Error reading PDF: {str(e)}"
+def normalize_text(text):
+    """Stage 2: collapses whitespace within one page."""
+    return re.sub(r"\s+", " ", text).strip()
 
-    # -----------------------------
-    # Clean Text
-    # -----------------------------
-    full_text = re.sub(r"\s+", " ", full_text).strip()
 
-    if len(full_text) < 50:
-        return False, "PDF content is too short."
+def iter_chunks(texts, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
+    """
+    Stage 3: Smart Chunking (Sentence Safe) over a stream of texts.
 
-    # -----------------------------
-    # Smart Chunking (Sentence Safe)
-    # -----------------------------
-    chunk_size = 500
-    overlap = 75
-    chunks = []
+    Only the unchunked tail is buffered, and the overlap is carried
+    across page boundaries, so memory does not grow with the document.
+    """
+    buffer = ""
+
+    for text in texts:
+        if not text:
+            continue
 
-    start = 0
-    text_length = len(full_text)
+        buffer = f"{buffer} {text}" if buffer else text
 
-    while start < text_length:
-        end = start + chunk_size
+        while len(buffer) > chunk_size:
+            end = chunk_size
 
-        if end < text_length:
             # Try to end chunk at sentence boundary
-            sentence_end = full_text.rfind(".", start, end)
+            sentence_end = buffer.rfind(".", 0, end)
             if sentence_end != -1:
                 end = sentence_end + 1
 
-        chunk = full_text[start:end].strip()
+            chunk = buffer[:end].strip()
+            if len(chunk) > 30:
+                yield chunk
 
-        if len(chunk) > 30:
-            chunks.append(chunk)
+            # Always move forward, even when a sentence ends inside the overlap
+            buffer = buffer[end - overlap:] if end > overlap else buffer[end:]
 
-        start = end - overlap
+    chunk = buffer.strip()
+    if len(chunk) > 30:
+        yield chunk
 
-    # Remove duplicates
-    chunks = list(dict.fromkeys(chunks))
 
-    print(f"[Indexer] Created {len(chunks)} clean text chunks.")
+def iter_batches(items, size):
+    """Stage 4: groups a stream into lists of at most `size` items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
-    # -----------------------------
-    # Update Database
-    # -----------------------------
-    try:
-        os.makedirs(DB_DIR, exist_ok=True)
 
-        client = chromadb.PersistentClient(path=DB_DIR)
+def process_pdf(filename="syllabus.pdf", collection_name="exam_syllabus",
+                source_id=None, progress=None, batch_size=EMBED_BATCH_SIZE,
+                extract_workers=None):
+    """
+    Reads PDF, chunks text safely, and syncs it into the Vector DB.
+
+    The PDF flows through a generator pipeline (page extract -> normalize
+    -> chunk -> embed in batches -> add in batches), so peak memory is
+    one batch rather than the whole book.
 
-        # Delete old collection
-        try:
-            client.delete_collection(name=collection_name)
-            print("[Indexer] Old collection deleted.")
-        except Exception:
-            pass
+    Indexing is incremental: chunks are keyed by content hash, so only new
+    or changed chunks are embedded and chunks no longer in the PDF are
+    dropped. Several PDFs share the collection, one source id each.
 
-        # Create new collection
-        collection = client.create_collection(
-            name=collection_name,
-            embedding_function=EMBEDDING_FUNC
-        )
+    The update is staged in a fresh physical collection (unchanged rows
+    are copied with their embeddings) and swapped in atomically, so the
+    old index keeps serving queries until ingestion finishes.
 
-        ids = [f"{collection_name}_{i}" for i in range(len(chunks))]
-        metadatas = [{"source": filename, "mode": "exam"} for _ in chunks]
+    `progress(**fields)` receives pages_total, pages_parsed,
+    chunks_embedded, chunks_total and phase updates.
+    `extract_workers` overrides pdf_extract.EXTRACT_WORKERS (1 = serial).
+    """
+
+    source_id = source_id or filename
+    progress = progress or _no_progress
+
+    pdf_path = os.path.join(UPLOAD_DIR, filename)
+    print(f"[Indexer] Processing: {filename}...")
+
+    if not os.path.exists(pdf_path):
+        return False, "File not found on server."
+
+    try:
+        reader = PdfReader(pdf_path)
 
-        collection.add(
-            documents=chunks,
-            ids=ids,
-            metadatas=metadatas
-        )
+        if reader.is_encrypted:
+            return False, "PDF is encrypted."
 
-        print("[Indexer] Database Updated Successfully!")
-        return True, f"Success! Indexed {len(chunks)} topics."
+        pages_total = len(reader.pages)
+
+    except Exception as e:
+        return False, f"Error reading PDF: {str(e)}"
+
+    progress(phase="indexing", pages_total=pages_total)
+    started = time.perf_counter()
+
+    try:
+        with _INDEX_LOCK:
+            active_name = store.get_active_name(collection_name)
+            active = store.get_collection(active_name)
+
+            existing_ids = set()
+            if active is not None:
+                existing = active.get(where={"source": source_id}, include=[])
+                existing_ids = set(existing.get("ids") or [])
+
+            # -----------------------------
+            # Stage New Physical Collection
+            # -----------------------------
+            staging_name = f"{collection_name}_{int(time.time() * 1000)}"
+            staging = store.create_collection(staging_name)
+
+            seen_ids = set()
+            stats = {"chars": 0, "chunks": 0, "new": 0}
+
+            def counted(texts):
+                for text in texts:
+                    stats["chars"] += len(text)
+                    yield text
+
+            try:
+                if active is not None:
+                    _copy_rows(active, staging, where={"source": {"$ne": source_id}})
+
+                pages = (
+                    normalize_text(text)
+                    for text in iter_page_texts(reader, progress, pdf_path, extract_workers)
+                )
+                chunks = iter_chunks(counted(pages))
+
+                for batch in iter_batches(chunks, batch_size):
+                    fresh, unchanged = [], []
+
+                    for chunk in batch:
+                        cid = chunk_id(source_id, chunk)
+                        if cid in seen_ids:
+                            continue  # Remove duplicates
+                        seen_ids.add(cid)
+                        (unchanged if cid in existing_ids else fresh).append((cid, chunk))
+
+                    # Unchanged chunks reuse their stored embeddings
+                    if unchanged:
+                        _copy_rows(active, staging, ids=[cid for cid, _ in unchanged])
+
+                    # Only unseen chunks pay for embedding
+                    if fresh:
+                        documents = [chunk for _, chunk in fresh]
+                        staging.add(
+                            ids=[cid for cid, _ in fresh],
+                            embeddings=embeddings.embed_texts(documents),
+                            documents=documents,
+                            metadatas=[{"source": source_id, "mode": "exam"} for _ in fresh]
+                        )
+
+                    stats["chunks"] += len(fresh) + len(unchanged)
+                    stats["new"] += len(fresh)
+                    progress(chunks_embedded=stats["new"], chunks_total=stats["chunks"])
+
+                if stats["chars"] < 50:
+                    raise ValueError("PDF content is too short.")
+
+            except Exception:
+                store.delete_collection(staging_name)
+                raise
+
+            # Lexical index is ready before the new collection goes live
+            bm25.build_index(staging_name, staging)
+
+            # -----------------------------
+            # Atomic Swap
+            # -----------------------------
+            progress(phase="swapping")
+            store.set_active_name(collection_name, staging_name)
+
+            if active is not None:
+                try:
+                    store.delete_collection(active_name)
+                except Exception:
+                    pass
+
+    except ValueError as e:
+        return False, str(e)
 
     except Exception as e:
         print(f"[DB Error] {e}")
         return False, f"Database Error: {str(e)}"
 
+    elapsed = max(time.perf_counter() - started, 1e-6)
+    pages_per_sec = round(pages_total / elapsed, 2)
+    chunks_per_sec = round(stats["chunks"] / elapsed, 2)
+    progress(pages_per_sec=pages_per_sec, chunks_per_sec=chunks_per_sec)
+
+    removed = len(existing_ids - seen_ids)
+    print(
+        f"[Indexer] Database Updated Successfully! "
+        f"New: {stats['new']} | Removed: {removed} | "
+        f"Unchanged: {stats['chunks'] - stats['new']} | "
+        f"{pages_per_sec} pages/s, {chunks_per_sec} chunks/s"
+    )
+    return True, f"Success! Indexed {stats['chunks']} topics ({stats['new']} new)."
+
 
 def clear_database(collection_name="exam_syllabus"):
     """
-    Resets the Vector DB folder and deletes the uploaded PDF.
+    Resets the Vector DB folder and deletes the uploaded PDFs.
     """
 
     try:
-        client = chromadb.PersistentClient(path=DB_DIR)
+        with _INDEX_LOCK:
+            try:
+                store.delete_collection(store.get_active_name(collection_name))
+                print("[Indexer] Collection removed.")
+            except Exception:
+                pass
 
-        try:
-            client.delete_collection(name=collection_name)
-            print("[Indexer] Collection removed.")
-        except Exception:
-            pass
+            store.set_active_name(collection_name, None)
 
         if os.path.exists(DB_DIR) and not os.listdir(DB_DIR):
             shutil.rmtree(DB_DIR)
+            store.reset_client()
             print("[Indexer] Empty DB folder removed.")
 
-        pdf_path = os.path.join(UPLOAD_DIR, "syllabus.pdf")
-        if os.path.exists(pdf_path):
-            os.remove(pdf_path)
-            print("[Indexer] PDF File Removed.")
+        if os.path.isdir(UPLOAD_DIR):
+            for name in os.listdir(UPLOAD_DIR):
+                if name.lower().endswith(".pdf"):
+                    os.remove(os.path.join(UPLOAD_DIR, name))
+                    print(f"[Indexer] PDF File Removed: {name}")
 
         return True, "Exam Database & PDF Reset Successfully."
 
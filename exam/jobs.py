@@ -0,0 +1,123 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from exam import indexer
+
+
+# --- CONFIGURATION ---
+MAX_WORKERS = 1          # Ingestion is CPU bound and index writes are serialized
+MAX_QUEUED = 4           # Uploads beyond this are rejected instead of piling up
+JOB_RETENTION = 3600     # Seconds to keep finished jobs for status polling
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="ingest")
+_JOBS = {}
+_LOCK = threading.Lock()
+
+
+def _prune(now):
+    for job_id in [
+        jid for jid, job in _JOBS.items()
+        if job["finished_at"] and now - job["finished_at"] > JOB_RETENTION
+    ]:
+        del _JOBS[job_id]
+
+
+def _update(job_id, **fields):
+    with _LOCK:
+        job = _JOBS.get(job_id)
+        if not job:
+            return
+
+        if "phase" in fields and fields["phase"] != job["phase"]:
+            job["phase_started_at"] = time.time()
+
+        job.update(fields)
+
+
+def _run(job_id, filename):
+    _update(job_id, status="running", started_at=time.time())
+
+    try:
+        success, message = indexer.process_pdf(
+            filename,
+            progress=lambda **fields: _update(job_id, **fields)
+        )
+    except Exception as e:
+        success, message = False, f"Ingestion Error: {e}"
+
+    _update(
+        job_id,
+        status="done" if success else "error",
+        phase="finished",
+        message=message,
+        finished_at=time.time()
+    )
+
+
+def submit(filename):
+    """
+    Queues a PDF for ingestion.
+    Returns the job id, or None when the queue is full.
+    """
+    now = time.time()
+
+    with _LOCK:
+        _prune(now)
+
+        active = sum(1 for job in _JOBS.values() if job["status"] in ("queued", "running"))
+        if active >= MAX_WORKERS + MAX_QUEUED:
+            return None
+
+        job_id = uuid.uuid4().hex[:12]
+        _JOBS[job_id] = {
+            "id": job_id,
+            "filename": filename,
+            "status": "queued",
+            "phase": "queued",
+            "message": "",
+            "pages_total": 0,
+            "pages_parsed": 0,
+            "chunks_total": 0,
+            "chunks_embedded": 0,
+            "pages_per_sec": None,
+            "chunks_per_sec": None,
+            "created_at": now,
+            "started_at": None,
+            "phase_started_at": now,
+            "finished_at": None
+        }
+
+    _EXECUTOR.submit(_run, job_id, filename)
+    print(f"[Ingest] Job {job_id} queued for {filename}.")
+    return job_id
+
+
+def _estimate_eta(job, now):
+    """
+    Seconds remaining, extrapolated from the page rate. Parsing and
+    embedding are interleaved page by page, so pages track overall progress.
+    None when there is not enough progress to estimate.
+    """
+    if job["phase"] != "indexing":
+        return None
+
+    done, total = job["pages_parsed"], job["pages_total"]
+    if not done or not total or done >= total:
+        return None
+
+    elapsed = now - job["phase_started_at"]
+    return round(elapsed / done * (total - done), 1)
+
+
+def get_status(job_id):
+    """Returns a snapshot of the job, or None if unknown."""
+    with _LOCK:
+        job = _JOBS.get(job_id)
+        if not job:
+            return None
+        snapshot = dict(job)
+
+    snapshot["eta_seconds"] = _estimate_eta(snapshot, time.time())
+    return snapshot
@@ -0,0 +1,212 @@
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+
+
+# --- CONFIGURATION ---
+VECTOR_DTYPE = "float32"   # "float16" halves disk/memory at some precision cost
+
+
+def _matches(metadata, where):
+    """Supports the filters the exam indexer uses: equality and $ne."""
+    if not where:
+        return True
+
+    for field, condition in where.items():
+        value = (metadata or {}).get(field)
+        if isinstance(condition, dict):
+            if "$ne" in condition and value == condition["$ne"]:
+                return False
+            if "$eq" in condition and value != condition["$eq"]:
+                return False
+        elif value != condition:
+            return False
+
+    return True
+
+
+class NumpyCollection:
+    """
+    Brute-force vector collection stored next to its chunk texts.
+
+    Files in `path`:
+        vectors.bin   normalized embeddings, one row per chunk (raw VECTOR_DTYPE)
+        chunks.jsonl  {"id", "document", "metadata"} per line, same order
+        meta.json     {"count", "dim", "dtype"}
+
+    Rows are appended batch by batch while indexing and memory-mapped for
+    queries, so top-k is one matrix-vector product plus argpartition.
+    Implements the subset of Chroma's collection API the exam code uses.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded_count = None
+        self._vectors = None
+        self._index = {}
+        self._ids = []
+        self._documents = []
+        self._metadatas = []
+
+    # -----------------------------
+    # Files
+    # -----------------------------
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _read_meta(self):
+        try:
+            with open(self._file("meta.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"count": 0, "dim": 0, "dtype": VECTOR_DTYPE}
+
+    def _load(self):
+        """(Re)loads rows if the files grew since the last load."""
+        meta = self._read_meta()
+        if self._loaded_count == meta["count"]:
+            return
+
+        ids, documents, metadatas = [], [], []
+        if meta["count"]:
+            with open(self._file("chunks.jsonl"), "r", encoding="utf-8") as f:
+                for line in f:
+                    row = json.loads(line)
+                    ids.append(row["id"])
+                    documents.append(row["document"])
+                    metadatas.append(row["metadata"])
+
+            vectors = np.memmap(
+                self._file("vectors.bin"),
+                dtype=meta["dtype"],
+                mode="r",
+                shape=(meta["count"], meta["dim"])
+            )
+        else:
+            vectors = np.zeros((0, 0), dtype=VECTOR_DTYPE)
+
+        self._ids, self._documents, self._metadatas = ids, documents, metadatas
+        self._index = {cid: i for i, cid in enumerate(ids)}
+        self._vectors = vectors
+        self._loaded_count = meta["count"]
+
+    def count(self):
+        with self._lock:
+            self._load()
+            return len(self._ids)
+
+    # -----------------------------
+    # Chroma-compatible API
+    # -----------------------------
+
+    def add(self, ids, embeddings, documents, metadatas):
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = (vectors / np.maximum(norms, 1e-12)).astype(VECTOR_DTYPE)
+
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            meta = self._read_meta()
+
+            if meta["count"] and meta["dim"] != vectors.shape[1]:
+                raise ValueError("Embedding dimension does not match the collection.")
+
+            with open(self._file("vectors.bin"), "ab") as f:
+                f.write(vectors.tobytes())
+
+            with open(self._file("chunks.jsonl"), "a", encoding="utf-8") as f:
+                for cid, doc, metadata in zip(ids, documents, metadatas):
+                    f.write(json.dumps({"id": cid, "document": doc, "metadata": metadata}) + "\n")
+
+            meta = {
+                "count": meta["count"] + len(ids),
+                "dim": int(vectors.shape[1]),
+                "dtype": VECTOR_DTYPE
+            }
+            tmp_path = self._file("meta.json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, self._file("meta.json"))
+
+    def get(self, ids=None, where=None, include=None, limit=None, offset=0):
+        include = include or []
+
+        with self._lock:
+            self._load()
+
+            if ids is not None:
+                rows = [self._index[cid] for cid in ids if cid in self._index]
+            else:
+                rows = [
+                    i for i, metadata in enumerate(self._metadatas)
+                    if _matches(metadata, where)
+                ]
+                rows = rows[offset:offset + limit] if limit else rows[offset:]
+
+            result = {"ids": [self._ids[i] for i in rows]}
+
+            if "documents" in include:
+                result["documents"] = [self._documents[i] for i in rows]
+            if "metadatas" in include:
+                result["metadatas"] = [self._metadatas[i] for i in rows]
+            if "embeddings" in include:
+                result["embeddings"] = [np.asarray(self._vectors[i], dtype=np.float32) for i in rows]
+
+            return result
+
+    def query(self, query_embeddings, n_results=3, include=None):
+        """
+        Top-k by cosine similarity. Distances are squared L2 between unit
+        vectors (2 - 2cos), the same scale Chroma's default space returns.
+        ids, documents and distances are always returned.
+        """
+
+        with self._lock:
+            self._load()
+            vectors, ids, documents = self._vectors, self._ids, self._documents
+
+        result = {"ids": [], "documents": [], "distances": []}
+
+        for embedding in query_embeddings:
+            query = np.asarray(embedding, dtype=np.float32)
+            query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+            if not len(ids):
+                rows, scores = [], np.zeros(0)
+            else:
+                scores = vectors @ query.astype(vectors.dtype)
+                k = min(n_results, len(ids))
+                top = np.argpartition(-scores, k - 1)[:k]
+                rows = top[np.argsort(-scores[top])]
+
+            result["ids"].append([ids[i] for i in rows])
+            result["documents"].append([documents[i] for i in rows])
+            result["distances"].append([float(2 - 2 * scores[i]) for i in rows])
+
+        return result
+
+
+def create_collection(root, name):
+    path = os.path.join(root, name)
+    if os.path.exists(path):
+        raise ValueError(f"Collection {name} already exists.")
+    os.makedirs(path)
+    return NumpyCollection(path)
+
+
+def get_collection(root, name):
+    path = os.path.join(root, name)
+    if not os.path.isdir(path):
+        return None
+    return NumpyCollection(path)
+
+
+def delete_collection(root, name):
+    path = os.path.join(root, name)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
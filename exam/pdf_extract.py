@@ -0,0 +1,122 @@
+import atexit
+import os
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from pypdf import PdfReader
+
+
+# --- CONFIGURATION ---
+EXTRACT_WORKERS = max(1, (os.cpu_count() or 1) - 1)   # 1 = serial extraction
+PAGES_PER_TASK = 16                                    # Page range per worker task
+PARALLEL_MIN_PAGES = 32                                # Smaller PDFs stay serial
+
+# Spawned workers re-run the parent's __main__ module (server.py: Flask,
+# numpy and the rest of the app), so starting one is expensive. One pool is
+# created on first use, reused for every PDF and shut down at exit.
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _extract_page_range(pdf_path, start, stop):
+    """Worker: extracts text for pages [start, stop) in its own process."""
+    reader = PdfReader(pdf_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _get_pool(workers):
+    """
+    The shared extraction pool, sized by the first caller. Workers are
+    spawned, not forked: the server process holds threads, sockets and
+    the model.
+    """
+    global _POOL
+
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _POOL
+
+
+def shutdown_pool():
+    """Stops the worker processes (registered to run at exit)."""
+    global _POOL
+
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_pool)
+
+
+def _iter_parallel(pdf_path, pages_total, workers, start_page=0):
+    """
+    Fans page ranges out over the shared process pool and yields
+    (page_no, text) in page order. At most 2 tasks per worker are in
+    flight, so finished ranges never pile up ahead of a slow consumer.
+    """
+    pool = _get_pool(workers)
+    pending = deque()
+    ranges = (
+        (start, min(start + PAGES_PER_TASK, pages_total))
+        for start in range(start_page, pages_total, PAGES_PER_TASK)
+    )
+
+    try:
+        for _ in range(workers * 2):
+            rng = next(ranges, None)
+            if rng is None:
+                break
+            pending.append((rng[0], pool.submit(_extract_page_range, pdf_path, *rng)))
+
+        while pending:
+            start, future = pending.popleft()
+            texts = future.result()
+
+            rng = next(ranges, None)
+            if rng is not None:
+                pending.append((rng[0], pool.submit(_extract_page_range, pdf_path, *rng)))
+
+            for offset, text in enumerate(texts):
+                yield start + offset, text
+
+    except BrokenProcessPool:
+        # A dead pool cannot be reused; the next PDF starts a fresh one
+        shutdown_pool()
+        raise
+
+    finally:
+        # The consumer may stop early; drop this PDF's queued ranges
+        for _, future in pending:
+            future.cancel()
+
+
+def iter_pages(reader, pdf_path=None, workers=None):
+    """
+    Yields (page_no, text) for every page, 0-based, in order.
+
+    Uses a process pool when a path is given, the PDF is large enough and
+    more than one worker is configured; falls back to serial extraction
+    (resuming where the pool stopped) if the pool cannot run.
+    """
+    workers = EXTRACT_WORKERS if workers is None else workers
+    pages_total = len(reader.pages)
+    next_page = 0
+
+    if pdf_path and workers > 1 and pages_total >= PARALLEL_MIN_PAGES:
+        try:
+            for page_no, text in _iter_parallel(pdf_path, pages_total, workers):
+                next_page = page_no + 1
+                yield page_no, text
+            return
+        except (BrokenProcessPool, OSError) as e:
+            print(f"[Indexer] Parallel extraction unavailable ({e}). Continuing serially.")
+
+    for page_no in range(next_page, pages_total):
+        yield page_no, reader.pages[page_no].extract_text() or ""
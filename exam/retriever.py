@@ -1,56 +1,194 @@
-import os
-import chromadb
-from chromadb.utils import embedding_functions
+import threading
+import time
 
+from exam import embeddings, store, query_cache, bm25
 
-CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_DIR = os.path.join(CURRENT_DIR, "vector_store")
 
-EMBEDDING_FUNC = embedding_functions.SentenceTransformerEmbeddingFunction(
-    model_name="all-MiniLM-L6-v2"
-)
+# --- CONFIGURATION ---
+HYBRID = True                 # Fuse BM25 with vector results (RRF)
+CANDIDATES = 10               # Hits per ranker before fusion
+BM25_FAST_COVERAGE = 1.0      # Every query term present in the top chunk...
+BM25_FAST_MARGIN = 1.5        # ...and it beats the runner-up by this factor
 
 
-def get_relevant_context(query, n_results=3, collection_name="exam_syllabus", min_score=0.3):
+class Retriever:
     """
-    Searches the Vector DB for text relevant to the query.
+    Long-lived handle on one exam collection.
 
-    Returns:
-        - Clean joined context string
-        - OR None if no meaningful match found
+    The collection (Chroma or NumPy backend, see exam/store.py) is looked
+    up once and reused until the indexer bumps the store version, so a
+    query costs only the similarity search itself.
     """
 
-    try:
-        client = chromadb.PersistentClient(path=DB_DIR)
+    def __init__(self, collection_name="exam_syllabus"):
+        self.collection_name = collection_name
+        self.last_latency_ms = None
+
+        self._collection = None
+        self._physical_name = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _get_collection(self):
+        version = store.get_version()
+
+        if self._collection is not None and self._version == version:
+            return self._collection
+
+        with self._lock:
+            physical_name = store.get_active_name(self.collection_name)
+            collection = store.get_collection(physical_name)
+            if collection is None:
+                print(f"[Retriever] Collection '{self.collection_name}' not found.")
+                return None
+
+            self._collection = collection
+            self._physical_name = physical_name
+            self._version = version
+
+        return collection
+
+    def invalidate(self):
+        with self._lock:
+            self._collection = None
+            self._version = None
+
+    def embed_query(self, query):
+        """Query embedding, served from the LRU when the question repeats."""
+        hits = query_cache.get_hits(self.collection_name, query, None)
+        if hits:
+            return hits["embedding"]
+
+        embedding = embeddings.get_embedding_function()([query])[0]
+        query_cache.put_hits(self.collection_name, query, None, {"embedding": embedding})
+        return embedding
+
+    @staticmethod
+    def _is_confident(ranked):
+        """High lexical confidence: full term coverage and a clear winner."""
+        if not ranked:
+            return False
+        top_id, top_score, top_coverage = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        return top_coverage >= BM25_FAST_COVERAGE and top_score >= BM25_FAST_MARGIN * runner_up
+
+    def search(self, query, n_results=3):
+        """
+        Top-k hits for a query:
+        {"embedding", "ids", "documents", "similarities"} or None.
+
+        BM25 runs first; when it is confident the embedding model is
+        skipped entirely. Otherwise BM25 and vector rankings are fused
+        with reciprocal rank fusion. Repeated questions are served from
+        the query cache.
+        """
+        hits = query_cache.get_hits(self.collection_name, query, n_results)
+        if hits:
+            return hits
+
+        collection = self._get_collection()
+        if collection is None:
+            return None
 
         # -----------------------------
-        # Check if collection exists
+        # Lexical Pass (BM25)
         # -----------------------------
-        existing_collections = [c.name for c in client.list_collections()]
-
-        if collection_name not in existing_collections:
-            print(f"[Retriever] Collection '{collection_name}' not found.")
-            return None
-
-        collection = client.get_collection(
-            name=collection_name,
-            embedding_function=EMBEDDING_FUNC
-        )
+        ranked = []
+        if HYBRID:
+            index = bm25.get_index(self._physical_name, collection)
+            ranked = index.search(query, k=CANDIDATES)
+
+        lexical = {doc_id: coverage for doc_id, _, coverage in ranked}
+
+        if self._is_confident(ranked):
+            top = ranked[:n_results]
+            hits = {
+                "embedding": None,
+                "ids": [doc_id for doc_id, _, _ in top],
+                "documents": [index.documents[doc_id] for doc_id, _, _ in top],
+                "similarities": [coverage for _, _, coverage in top]
+            }
+            print("[Retriever] BM25 fast path.")
+            query_cache.put_hits(self.collection_name, query, n_results, hits)
+            return hits
 
         # -----------------------------
         # Query Vector DB
         # -----------------------------
+        embedding = self.embed_query(query)
+
         results = collection.query(
-            query_texts=[query],
-            n_results=n_results,
+            query_embeddings=[embedding],
+            n_results=max(n_results, CANDIDATES) if HYBRID else n_results,
             include=["documents", "distances"]
         )
 
-        if not results or not results.get("documents"):
+        dense_ids = (results.get("ids") or [[]])[0]
+        documents = dict(zip(dense_ids, (results.get("documents") or [[]])[0]))
+
+        # Lower distance = better match
+        similarities = {
+            doc_id: 1 - distance
+            for doc_id, distance in zip(dense_ids, (results.get("distances") or [[]])[0])
+            if distance is not None
+        }
+
+        # -----------------------------
+        # Fusion (RRF)
+        # -----------------------------
+        if ranked:
+            fused = bm25.reciprocal_rank_fusion([dense_ids, [doc_id for doc_id, _, _ in ranked]])
+            for doc_id in lexical:
+                documents.setdefault(doc_id, index.documents[doc_id])
+                # Keyword-only hits are scored by how much of the query they contain
+                similarities[doc_id] = max(similarities.get(doc_id, 0.0), lexical[doc_id])
+        else:
+            fused = dense_ids
+
+        top_ids = fused[:n_results]
+        if not top_ids:
+            return None
+
+        hits = {
+            "embedding": embedding,
+            "ids": top_ids,
+            "documents": [documents[doc_id] for doc_id in top_ids],
+            "similarities": [similarities.get(doc_id) for doc_id in top_ids]
+        }
+
+        query_cache.put_hits(self.collection_name, query, n_results, hits)
+        return hits
+
+    def get_relevant_context(self, query, n_results=3, min_score=0.3):
+        """
+        Searches the Vector DB for text relevant to the query.
+
+        Returns:
+            - Clean joined context string
+            - OR None if no meaningful match found
+        """
+
+        start = time.perf_counter()
+
+        try:
+            hits = self.search(query, n_results)
+
+        except Exception as e:
+            # Handle may point at a collection removed underneath us
+            self.invalidate()
+            print(f"[Retriever Error] {e}")
+            return None
+
+        finally:
+            self.last_latency_ms = (time.perf_counter() - start) * 1000
+
+        print(f"[Retriever] Query took {self.last_latency_ms:.1f} ms.")
+
+        if not hits:
             return None
 
-        documents = results["documents"][0]
-        distances = results.get("distances", [[]])[0]
+        documents = hits["documents"]
+        similarities = hits["similarities"]
 
         if not documents:
             return None
@@ -60,13 +198,10 @@ def get_relevant_context(query, n_results=3, collection_name="exam_syllabus", mi
         # -----------------------------
         filtered_chunks = []
 
-        for doc, distance in zip(documents, distances):
-            if distance is None:
+        for doc, similarity_score in zip(documents, similarities):
+            if similarity_score is None:
                 continue
 
-            # Lower distance = better match
-            similarity_score = 1 - distance
-
             if similarity_score >= min_score:
                 filtered_chunks.append(doc.strip())
 
@@ -77,10 +212,37 @@ def get_relevant_context(query, n_results=3, collection_name="exam_syllabus", mi
         filtered_chunks = list(dict.fromkeys(filtered_chunks))
 
         # Clean Join
-        clean_context = "\n\n---\n\n".join(filtered_chunks)
+        return "\n\n---\n\n".join(filtered_chunks)
+
+
+_RETRIEVERS = {}
+_RETRIEVERS_LOCK = threading.Lock()
+
+
+def get_retriever(collection_name="exam_syllabus"):
+    """Returns the shared Retriever for a collection."""
+    with _RETRIEVERS_LOCK:
+        if collection_name not in _RETRIEVERS:
+            _RETRIEVERS[collection_name] = Retriever(collection_name)
+        return _RETRIEVERS[collection_name]
 
-        return clean_context
 
-    except Exception as e:
-        print(f"[Retriever Error] {e}")
-        return None
+def get_query_embedding(query, collection_name="exam_syllabus"):
+    """Embedding already computed for this query during retrieval, or None."""
+    hits = query_cache.get_hits(collection_name, query, None)
+    return hits["embedding"] if hits else None
+
+
+def get_relevant_context(query, n_results=3, collection_name="exam_syllabus", min_score=0.3):
+    """
+    Searches the Vector DB for text relevant to the query.
+
+    Returns:
+        - Clean joined context string
+        - OR None if no meaningful match found
+    """
+    return get_retriever(collection_name).get_relevant_context(
+        query,
+        n_results=n_results,
+        min_score=min_score
+    )
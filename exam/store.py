@@ -0,0 +1,141 @@
+import os
+import json
+import threading
+
+
+# --- CONFIGURATION ---
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_DIR = os.path.join(CURRENT_DIR, "vector_store")
+NUMPY_DIR = os.path.join(DB_DIR, "numpy")
+ACTIVE_FILE = os.path.join(DB_DIR, "active_collections.json")
+
+# "chroma"  -> ChromaDB persistent client (SQLite/HNSW)
+# "numpy"   -> memory-mapped matrix + brute-force top-k (exam/numpy_index.py)
+# Switching backends requires re-uploading the syllabus.
+BACKEND = "chroma"
+
+_CLIENT = None
+_VERSION = 0
+_LOCK = threading.Lock()
+
+
+def get_client():
+    """Returns the shared persistent Chroma client (opened once)."""
+    global _CLIENT
+
+    import chromadb
+
+    with _LOCK:
+        if _CLIENT is None:
+            os.makedirs(DB_DIR, exist_ok=True)
+            _CLIENT = chromadb.PersistentClient(path=DB_DIR)
+        return _CLIENT
+
+
+def reset_client():
+    """Forgets the client, e.g. after the store folder was removed."""
+    global _CLIENT
+
+    with _LOCK:
+        _CLIENT = None
+
+
+# -----------------------------
+# Backend-Neutral Collections
+# -----------------------------
+# Both backends return objects with Chroma's add/get/query interface.
+# Every add and query passes vectors from exam/embeddings.py explicitly, so
+# Chroma collections are opened without an embedding function: opening one
+# never loads the model.
+
+def get_collection(name):
+    """Returns the physical collection, or None if it does not exist."""
+    if BACKEND == "numpy":
+        from exam import numpy_index
+        return numpy_index.get_collection(NUMPY_DIR, name)
+
+    try:
+        return get_client().get_collection(name=name, embedding_function=None)
+    except Exception:
+        return None
+
+
+def create_collection(name):
+    if BACKEND == "numpy":
+        from exam import numpy_index
+        return numpy_index.create_collection(NUMPY_DIR, name)
+
+    return get_client().create_collection(name=name, embedding_function=None)
+
+
+def delete_collection(name):
+    if BACKEND == "numpy":
+        from exam import numpy_index
+        numpy_index.delete_collection(NUMPY_DIR, name)
+        return
+
+    get_client().delete_collection(name=name)
+
+
+def get_version():
+    """Index version; changes whenever the exam index is modified."""
+    return _VERSION
+
+
+def bump_version():
+    """Called by the indexer after every change so cached handles refresh."""
+    global _VERSION
+
+    with _LOCK:
+        _VERSION += 1
+        return _VERSION
+
+
+# -----------------------------
+# Active Collection Pointer
+# -----------------------------
+# Ingestion builds a new physical collection and then repoints the logical
+# name at it, so queries keep hitting the old index until the swap.
+
+def _pointer_key(collection_name):
+    # Chroma keeps the bare name so existing stores stay valid
+    if BACKEND == "chroma":
+        return collection_name
+    return f"{BACKEND}:{collection_name}"
+
+
+def _read_pointers():
+    try:
+        with open(ACTIVE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            return data if isinstance(data, dict) else {}
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def get_active_name(collection_name):
+    """Physical collection currently serving a logical collection name."""
+    return _read_pointers().get(_pointer_key(collection_name), collection_name)
+
+
+def set_active_name(collection_name, physical_name):
+    """
+    Atomically repoints a logical collection and bumps the version.
+    Pass None to drop the pointer.
+    """
+    with _LOCK:
+        pointers = _read_pointers()
+
+        key = _pointer_key(collection_name)
+        if physical_name is None:
+            pointers.pop(key, None)
+        else:
+            pointers[key] = physical_name
+
+        os.makedirs(DB_DIR, exist_ok=True)
+        tmp_path = ACTIVE_FILE + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(pointers, f, indent=4)
+        os.replace(tmp_path, ACTIVE_FILE)
+
+    return bump_version()
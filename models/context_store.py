@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+# --- CONFIGURATION ---
+MAX_SESSIONS = 32            # Entries kept across all sessions/modes
+MAX_CONTEXT_TOKENS = 3072    # Rebuild before a context outgrows num_ctx (4096)
+MAX_TOTAL_TOKENS = 65536     # Memory bound across all stored contexts
+IDLE_TIMEOUT = 15 * 60       # Seconds before an unused context is dropped
+
+# (session_id, mode) -> {"context": [...], "turns": [...], "last_used": float}
+_ENTRIES = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def user_turns(history):
+    return [
+        msg.get("content", "")
+        for msg in (history or [])
+        if msg.get("role") == "user"
+    ]
+
+
+def _total_tokens():
+    return sum(len(entry["context"]) for entry in _ENTRIES.values())
+
+
+def _evict(now):
+    """Drops idle entries, then least recently used ones over the limits."""
+
+    for key in [k for k, e in _ENTRIES.items() if now - e["last_used"] > IDLE_TIMEOUT]:
+        del _ENTRIES[key]
+
+    while _ENTRIES and (len(_ENTRIES) > MAX_SESSIONS or _total_tokens() > MAX_TOTAL_TOKENS):
+        _ENTRIES.popitem(last=False)
+
+
+def get_context(session_id, mode, history):
+    """
+    Returns (context_tokens, covered_user_turns) if the stored Ollama
+    context still matches the conversation, otherwise None.
+
+    The context is valid while the user turns in `history` are the most
+    recent turns it already covers. A reset or edited history forces a
+    full prompt rebuild.
+    """
+
+    key = (session_id, mode)
+    now = time.time()
+
+    with _LOCK:
+        _evict(now)
+
+        entry = _ENTRIES.get(key)
+        if not entry:
+            return None
+
+        turns = user_turns(history)
+        covered = entry["turns"]
+
+        if not turns or len(turns) > len(covered) or covered[-len(turns):] != turns:
+            del _ENTRIES[key]
+            return None
+
+        entry["last_used"] = now
+        _ENTRIES.move_to_end(key)
+
+        return entry["context"], list(covered)
+
+
+def put_context(session_id, mode, turns, context):
+    """Stores the context returned by Ollama for the next turn."""
+
+    key = (session_id, mode)
+
+    with _LOCK:
+        if not context or len(context) > MAX_CONTEXT_TOKENS:
+            _ENTRIES.pop(key, None)
+            return
+
+        _ENTRIES[key] = {
+            "context": list(context),
+            "turns": list(turns),
+            "last_used": time.time()
+        }
+        _ENTRIES.move_to_end(key)
+
+        _evict(time.time())
+
+
+def invalidate(session_id=None, mode=None):
+    """Forgets stored contexts (all of them when no filter is given)."""
+
+    with _LOCK:
+        for key in list(_ENTRIES):
+            if session_id is not None and key[0] != session_id:
+                continue
+            if mode is not None and key[1] != mode:
+                continue
+            del _ENTRIES[key]
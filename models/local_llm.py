@@ -1,18 +1,31 @@
 import requests
+import json
 import re
+from models import context_store
+from models.ollama_client import OllamaClient
 
 # --- CONFIGURATION ---
-OLLAMA_URL = "http://localhost:11434/api/generate"
+OLLAMA_HOST = "http://localhost:11434"
 MODEL_NAME = "mistral"
 
+CONNECT_TIMEOUT = 2
+READ_TIMEOUT = 90
+
+# Shared keep-alive client (connection pool + cached health state)
+CLIENT = OllamaClient(
+    OLLAMA_HOST,
+    connect_timeout=CONNECT_TIMEOUT,
+    read_timeout=READ_TIMEOUT
+)
+
+# Modes whose prompt prefix is stable between turns, so Ollama's KV context
+# can be carried forward. Exam prompts embed fresh retrieval context.
+CONTEXT_REUSE_MODES = {"casual", "coding", "movie"}
+
 
 def connect_ollama():
-    """Checks if Ollama server is running."""
-    try:
-        r = requests.get("http://localhost:11434/", timeout=2)
-        return r.status_code == 200
-    except requests.RequestException:
-        return False
+    """Checks if Ollama server is running (cached health state)."""
+    return CLIENT.is_healthy()
 
 
 def sanitize_output(text: str) -> str:
@@ -160,13 +173,21 @@ def build_prompt(user_text, mode="casual", context=None, history=None):
     return user_text
 
 
-def _execute_ollama(prompt, temperature):
-    """Internal function to send request to Ollama."""
+def build_followup_prompt(user_text):
+    """
+    Prompt for a turn that continues a cached Ollama context.
+    System prompt and history are already inside the KV context.
+    """
+    return f"User: {user_text}\nAssistant:"
+
+
+def _build_payload(prompt, temperature, stream=False, context=None):
+    """Builds the Ollama generate payload."""
 
     payload = {
         "model": MODEL_NAME,
         "prompt": prompt,
-        "stream": False,
+        "stream": stream,
         "options": {
             "temperature": temperature,
             "num_ctx": 4096,
@@ -174,54 +195,252 @@ def _execute_ollama(prompt, temperature):
         }
     }
 
+    if context:
+        payload["context"] = context
+
+    return payload
+
+
+def _generate(prompt, temperature, context=None, timeout=None):
+    """
+    Sends a non-streaming request to Ollama.
+    Returns (text, context_tokens); context is None on failure.
+    """
+
+    payload = _build_payload(prompt, temperature, context=context)
+
     try:
-        res = requests.post(OLLAMA_URL, json=payload, timeout=90)
+        res = CLIENT.post("/api/generate", payload, timeout=timeout)
         data = res.json()
 
         if "response" not in data:
-            return "Model response error."
+            return "Model response error.", None
 
-        return data["response"].strip()
+        return data["response"].strip(), data.get("context")
 
     except requests.RequestException as e:
-        return f"Brain Error: {e}"
+        return f"Brain Error: {e}", None
 
 
-def run_inference(user_text, mode="casual", context=None, history=None):
-    """Standard inference wrapper."""
+def _execute_ollama(prompt, temperature, timeout=None):
+    """Internal function to send request to Ollama."""
+    return _generate(prompt, temperature, timeout=timeout)[0]
 
-    if not connect_ollama():
-        return "Error: Ollama is not running."
 
-    prompt = build_prompt(user_text, mode, context, history)
+def _stream_ollama(prompt, temperature, context=None, final=None, timeout=None):
+    """
+    Internal generator that yields raw tokens from Ollama as they arrive.
+    Ollama streams one JSON object per line until "done" is true.
+    The context array from the last line is stored in `final` if given.
+    """
+
+    payload = _build_payload(prompt, temperature, stream=True, context=context)
+
+    try:
+        with CLIENT.post("/api/generate", payload, timeout=timeout, stream=True) as res:
+            for line in res.iter_lines():
+                if not line:
+                    continue
+
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    continue
+
+                token = data.get("response", "")
+                if token:
+                    yield token
+
+                if data.get("done"):
+                    if final is not None:
+                        final["context"] = data.get("context")
+                    break
+
+    except requests.RequestException as e:
+        yield f"Brain Error: {e}"
+
+
+class IncrementalSanitizer:
+    """
+    Applies a line-based cleaner (e.g. sanitize_output) to a token stream.
+
+    Text is only committed up to the last whitespace, so word and line
+    based rules see complete words. Completed lines are cleaned once and
+    kept; each feed() only re-cleans the current line and returns the newly
+    cleaned delta. If a later token changes already-emitted text, the delta
+    is held back until the cleaned text becomes consistent again.
+    """
+
+    # Wrapped around a segment so clean_fn's final strip() keeps the
+    # indentation and blank lines at its edges
+    _ANCHOR = "\x00"
+
+    def __init__(self, clean_fn=None):
+        self.clean_fn = clean_fn or sanitize_output
+        self.raw = ""
+        self.emitted = ""
+        self._line_start = 0   # raw index after the last committed newline
+        self._prefix = ""      # cleaned raw[:_line_start]
+
+    def _emit(self, cleaned):
+        if not cleaned.startswith(self.emitted):
+            return ""
+        delta = cleaned[len(self.emitted):]
+        self.emitted = cleaned
+        return delta
+
+    def _clean_lines(self, segment):
+        cleaned = self.clean_fn(f"{self._ANCHOR}\n{segment}\n{self._ANCHOR}")
+        if cleaned.startswith(self._ANCHOR + "\n") and cleaned.endswith("\n" + self._ANCHOR):
+            return cleaned[2:-2]
+        return self.clean_fn(segment)
+
+    def feed(self, token):
+        self.raw += token
+
+        newline = self.raw.rfind("\n", self._line_start)
+        if newline != -1:
+            self._prefix += self._clean_lines(self.raw[self._line_start:newline]) + "\n"
+            self._line_start = newline + 1
+
+        # Separators and blank lines after the committed words go out with
+        # the next word, as clean_fn drops trailing whitespace
+        boundary = self.raw.rfind(" ", self._line_start)
+        tail = ""
+        if boundary != -1:
+            tail = self._clean_lines(self.raw[self._line_start:boundary])
+
+        cleaned = (self._prefix + tail).strip()
+        if not cleaned:
+            return ""
+
+        return self._emit(cleaned)
+
+    def flush(self):
+        """Cleans the full text and returns whatever is still pending."""
+        return self._emit(self.clean_fn(self.raw))
+
+    @property
+    def text(self):
+        return self.clean_fn(self.raw)
+
+
+def _temperature_for(mode):
+    """Temperature Control Per Mode."""
 
-    # Temperature Control Per Mode
     if mode == "casual":
-        temperature = 0.6
-    elif mode == "coding":
+        return 0.6
+    if mode == "coding":
         # 🔥 ZERO TEMPERATURE: Forces the model to be deterministic and structured.
-        temperature = 0.0
-    elif mode == "exam":
-        temperature = 0.0
-    elif mode == "movie":
-        temperature = 0.3
+        return 0.0
+    if mode == "exam":
+        return 0.0
+    if mode == "movie":
+        return 0.3
+    return 0.4
+
+
+def _prepare_prompt(user_text, mode, context, history, session_id):
+    """
+    Chooses between continuing a cached Ollama context and a full rebuild.
+    Returns (prompt, kv_context, covered_turns).
+    """
+
+    history = history or []
+
+    if mode in CONTEXT_REUSE_MODES:
+        cached = context_store.get_context(session_id, mode, history)
+        if cached:
+            kv_context, turns = cached
+            print(f"[LLM] Reusing KV context ({len(kv_context)} tokens) for '{mode}'.")
+            return build_followup_prompt(user_text), kv_context, turns + [user_text]
+
+    # Cover every user turn the caller holds, not just the window the
+    # prompt serializes, so the next turn's history is a suffix of it
+    turns = context_store.user_turns(history)
+
+    return build_prompt(user_text, mode, context, history), None, turns + [user_text]
+
+
+def _remember_context(session_id, mode, turns, new_context):
+    """Stores or drops the returned context for the next turn."""
+
+    if mode not in CONTEXT_REUSE_MODES:
+        return
+
+    if new_context:
+        context_store.put_context(session_id, mode, turns, new_context)
     else:
-        temperature = 0.4
+        context_store.invalidate(session_id, mode)
+
+
+def discard_context(mode, session_id="default"):
+    """
+    Drops the cached context for a turn whose answer was not kept
+    (e.g. rejected by the confidence gate), so the next turn rebuilds.
+    """
+    context_store.invalidate(session_id, mode)
+
+
+def run_inference(user_text, mode="casual", context=None, history=None,
+                  session_id="default", timeout=None):
+    """
+    Standard inference wrapper.
+    `timeout` overrides the client default as (connect, read) seconds.
+    """
+
+    if not connect_ollama():
+        return "Error: Ollama is not running."
+
+    prompt, kv_context, turns = _prepare_prompt(user_text, mode, context, history, session_id)
+
+    temperature = _temperature_for(mode)
+
+    raw_output, new_context = _generate(prompt, temperature, context=kv_context, timeout=timeout)
+    _remember_context(session_id, mode, turns, new_context)
 
-    raw_output = _execute_ollama(prompt, temperature)
-    
     # 🔥 Step 1: Basic cleaning
     cleaned = sanitize_output(raw_output)
-    
+
     # 🔥 Step 2: Enforce formatting specifically for Coding Mode
     return enforce_code_formatting(cleaned, mode)
 
 
-def run_raw_prompt(raw_prompt, temperature=0.3):
+def stream_inference(user_text, mode="casual", context=None, history=None,
+                     clean_fn=None, session_id="default", timeout=None):
+    """
+    Streaming variant of run_inference.
+    Yields sanitized text deltas as Ollama produces tokens.
+    Coding-mode formatting needs the full answer, so callers apply
+    enforce_code_formatting on the joined result.
+    """
+
+    if not connect_ollama():
+        yield "Error: Ollama is not running."
+        return
+
+    prompt, kv_context, turns = _prepare_prompt(user_text, mode, context, history, session_id)
+    sanitizer = IncrementalSanitizer(clean_fn)
+    final = {}
+
+    for token in _stream_ollama(prompt, _temperature_for(mode), context=kv_context,
+                                final=final, timeout=timeout):
+        delta = sanitizer.feed(token)
+        if delta:
+            yield delta
+
+    _remember_context(session_id, mode, turns, final.get("context"))
+
+    tail = sanitizer.flush()
+    if tail:
+        yield tail
+
+
+def run_raw_prompt(raw_prompt, temperature=0.3, timeout=None):
     """Executes a raw prompt string (used for Hybrid/Web modes)."""
 
     if not connect_ollama():
         return "Error: Ollama is not running."
 
-    raw_output = _execute_ollama(raw_prompt, temperature)
+    raw_output = _execute_ollama(raw_prompt, temperature, timeout=timeout)
     return sanitize_output(raw_output)
\ No newline at end of file
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class OllamaClient:
+    """
+    Keep-alive HTTP client for the local Ollama server.
+
+    - One pooled requests.Session shared by every call (no per-call TCP setup).
+    - Health state is cached: refreshed by an optional background prober,
+      and marked down passively whenever a call fails.
+    - Timeouts can be overridden per call as (connect, read).
+    """
+
+    def __init__(self, base_url="http://localhost:11434", pool_size=8,
+                 connect_timeout=2, read_timeout=90, health_ttl=10):
+        self.base_url = base_url.rstrip("/")
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.health_ttl = health_ttl
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._healthy = False
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._prober = None
+        self._stop = threading.Event()
+
+    # -----------------------------
+    # Health State
+    # -----------------------------
+
+    def _set_health(self, healthy):
+        with self._lock:
+            self._healthy = healthy
+            self._checked_at = time.monotonic()
+
+    def probe(self):
+        """Actively checks the server and updates the cached state."""
+        try:
+            r = self.session.get(self.base_url + "/", timeout=self.connect_timeout)
+            healthy = r.status_code == 200
+        except requests.RequestException:
+            healthy = False
+
+        self._set_health(healthy)
+        return healthy
+
+    def is_healthy(self):
+        """Returns the cached health state, probing only when it is stale."""
+        with self._lock:
+            fresh = time.monotonic() - self._checked_at < self.health_ttl
+            healthy = self._healthy
+
+        if fresh:
+            return healthy
+
+        return self.probe()
+
+    def mark_down(self):
+        """Passive failure signal from a failed call."""
+        self._set_health(False)
+
+    def start_prober(self, interval=5):
+        """Starts a daemon thread that keeps the health state fresh."""
+        if self._prober and self._prober.is_alive():
+            return
+
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.is_set():
+                self.probe()
+                self._stop.wait(interval)
+
+        self._prober = threading.Thread(target=loop, name="ollama-prober", daemon=True)
+        self._prober.start()
+
+    def stop_prober(self):
+        self._stop.set()
+
+    # -----------------------------
+    # Requests
+    # -----------------------------
+
+    def _timeout(self, timeout):
+        if timeout is None:
+            return (self.connect_timeout, self.read_timeout)
+        return timeout
+
+    def post(self, path, payload, timeout=None, stream=False):
+        """
+        POSTs JSON to Ollama over the pooled session.
+        Marks the server down and re-raises on connection errors;
+        a read timeout only means the model is slow, not that it is gone.
+        """
+        try:
+            res = self.session.post(
+                self.base_url + path,
+                json=payload,
+                timeout=self._timeout(timeout),
+                stream=stream
+            )
+        except requests.ConnectionError:
+            self.mark_down()
+            raise
+
+        self._set_health(True)
+        return res
@@ -1,81 +1,229 @@
 import json
 import os
 import random
+import threading
+from collections import defaultdict
+
+try:
+    from movie import vector_scoring
+except ImportError:   # NumPy not installed: indexed pure-Python scoring
+    vector_scoring = None
 
 DB_PATH = os.path.join(os.path.dirname(__file__), 'movie_db.json')
 
-def load_db():
+# Mood phrase -> genres it implies (supports multi-word detection)
+MOOD_MAP = {
+    "emotional": ["drama", "romance", "sad", "tearjerker"],
+    "feel good": ["comedy", "animation", "family", "happy"],
+    "dark": ["thriller", "horror", "crime", "mystery", "gritty"],
+    "exciting": ["action", "adventure", "sci-fi", "intense"]
+}
+
+# Scoring weights
+KEYWORD_SCORE = 5
+MOOD_SCORE = 4
+FAVORITE_SCORE = 3
+RATING_WEIGHT = 0.3
+MIN_SCORE = 4
+TOP_CANDIDATES = 5     # Shuffled for variety before picking three
+
+VECTORIZED = True      # Score with NumPy (movie/vector_scoring.py) when available
+
+def load_db(path=DB_PATH):
     try:
-        with open(DB_PATH, 'r', encoding='utf-8') as f:
+        with open(path, 'r', encoding='utf-8') as f:
             data = json.load(f)
             return data if isinstance(data, list) else []
     except (FileNotFoundError, Exception):
         return []
 
-def recommend(user_query, user_favorites=None):
+
+class MovieRecommender:
     """
-    Level 4 Recommendation Engine: Weighted Scoring & Precision Matching.
-    Fixed: Variable scope, Normalized ratings, and Threshold filtering.
+    Keeps the catalogue in memory with inverted indexes, reloading it only
+    when movie_db.json changes on disk.
+
+    Rating alone is worth at most 10 * RATING_WEIGHT = 3 < MIN_SCORE, so a
+    movie can only pass the threshold if the query or favourites touch it.
+    Only that candidate set is scored.
     """
-    movies = load_db()
-    if not movies:
-        return "Movie database is empty."
-
-    # Convert favorites to set for O(1) intersection
-    user_favorites_set = set(f.lower() for f in (user_favorites or []))
-    query_lower = user_query.lower().strip()
-    query_words = set(query_lower.split())
-    
-    scored_matches = []
-
-    # 1. MOOD MAP (Supports multi-word detection)
-    mood_map = {
-        "emotional": ["drama", "romance", "sad", "tearjerker"],
-        "feel good": ["comedy", "animation", "family", "happy"],
-        "dark": ["thriller", "horror", "crime", "mystery", "gritty"],
-        "exciting": ["action", "adventure", "sci-fi", "intense"]
-    }
-
-    # 2. RANKING ENGINE (Scoring Loop)
-    for movie in movies:
-        score = 0
-        m_genres = set(g.lower() for g in movie.get("genre", []))
-        m_moods = set(m.lower() for m in movie.get("mood", []))
-        m_title_words = set(movie.get("title", "").lower().split())
-        
-        # A. Direct Keyword Match (+5)
-        if query_words.intersection(m_genres | m_moods | m_title_words):
-            score += 5
 
-        # B. Phrase-based Mood Match (+4)
-        for mood, related_genres in mood_map.items():
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.movies = []
+        self._stamp = None
+        self._lock = threading.Lock()
+
+        self._term_index = defaultdict(set)    # genre/mood/title word -> movie ids
+        self._genre_index = defaultdict(set)   # genre -> movie ids
+        self._genres = []                      # movie id -> set of genres
+        self._matrix = None                    # vector_scoring.CatalogueMatrix
+
+    # -----------------------------
+    # Catalogue
+    # -----------------------------
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def _build(self, movies):
+        term_index = defaultdict(set)
+        genre_index = defaultdict(set)
+        genres = []
+
+        for movie_id, movie in enumerate(movies):
+            m_genres = set(g.lower() for g in movie.get("genre", []))
+            m_moods = set(m.lower() for m in movie.get("mood", []))
+            m_title_words = set(movie.get("title", "").lower().split())
+
+            for term in m_genres | m_moods | m_title_words:
+                term_index[term].add(movie_id)
+            for genre in m_genres:
+                genre_index[genre].add(movie_id)
+            genres.append(m_genres)
+
+        self.movies = movies
+        self._term_index = term_index
+        self._genre_index = genre_index
+        self._genres = genres
+
+        if VECTORIZED and vector_scoring is not None:
+            self._matrix = vector_scoring.CatalogueMatrix(
+                movies,
+                MOOD_MAP,
+                keyword_score=KEYWORD_SCORE,
+                mood_score=MOOD_SCORE,
+                favorite_score=FAVORITE_SCORE,
+                rating_weight=RATING_WEIGHT,
+                min_score=MIN_SCORE
+            )
+        else:
+            self._matrix = None
+
+    def refresh(self):
+        """Reloads the catalogue if the file changed since the last load."""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+
+        with self._lock:
+            if stamp == self._stamp:
+                return
+            movies = load_db(self.path)
+            self._build(movies)
+            self._stamp = stamp
+            print(f"[Recommender] Loaded {len(movies)} movies.")
+
+    # -----------------------------
+    # Scoring
+    # -----------------------------
+
+    def score(self, user_query, user_favorites=None, limit=None):
+        """Returns [(score, movie)] above MIN_SCORE, best first."""
+        self.refresh()
+
+        matrix, movies = self._matrix, self.movies
+        if matrix is not None:
+            return [
+                (score, movies[movie_id])
+                for score, movie_id in matrix.top_k(user_query, user_favorites, k=limit)
+            ]
+
+        user_favorites_set = set(f.lower() for f in (user_favorites or []))
+        query_lower = user_query.lower().strip()
+        query_words = set(query_lower.split())
+
+        term_index, genre_index = self._term_index, self._genre_index
+        scores = defaultdict(float)
+
+        # A. Direct Keyword Match (+5), once per movie
+        keyword_hits = set()
+        for word in query_words:
+            keyword_hits |= term_index.get(word, set())
+        for movie_id in keyword_hits:
+            scores[movie_id] += KEYWORD_SCORE
+
+        # B. Phrase-based Mood Match (+4 per matched phrase)
+        for mood, related_genres in MOOD_MAP.items():
             if mood in query_lower:
-                if m_genres.intersection(related_genres):
-                    score += 4
+                mood_hits = set()
+                for genre in related_genres:
+                    mood_hits |= genre_index.get(genre, set())
+                for movie_id in mood_hits:
+                    scores[movie_id] += MOOD_SCORE
 
         # C. User Preference Alignment (+3)
-        if user_favorites_set.intersection(m_genres):
-            score += 3
+        favorite_hits = set()
+        for genre in user_favorites_set:
+            favorite_hits |= genre_index.get(genre, set())
+        for movie_id in favorite_hits:
+            scores[movie_id] += FAVORITE_SCORE
 
-        # D. Quality Weight (Normalized: Rating * 0.3)
-        # 10/10 movie gives +3 points. This prevents rating from overriding intent.
-        rating = movie.get("rating", 0)
-        score += (rating * 0.3) 
+        # D. Quality Weight + E. Threshold Filter
+        scored_matches = []
+        for movie_id in sorted(scores):
+            movie = movies[movie_id]
+            score = scores[movie_id] + movie.get("rating", 0) * RATING_WEIGHT
+            if score >= MIN_SCORE:
+                scored_matches.append((score, movie))
 
-        # E. Threshold Filter
-        # Minimum score of 4 ensures the movie is actually relevant to the query/mood.
-        if score >= 4:
-            scored_matches.append((score, movie))
+        # Sort by Score (Primary) and Rating (Secondary); ties keep catalogue order
+        scored_matches.sort(key=lambda x: (x[0], x[1].get("rating", 0)), reverse=True)
+        return scored_matches[:limit] if limit is not None else scored_matches
 
-    if not scored_matches:
-        return "I couldn't find a specific match. Try a mood like 'dark' or 'feel good'!"
+    def score_batch(self, queries, favorites_list=None, limit=TOP_CANDIDATES):
+        """
+        score() for many queries or users at once (offline jobs).
+        Returns one [(score, movie)] list per query.
+        """
+        self.refresh()
+        favorites_list = favorites_list or [None] * len(queries)
 
-    # 3. SORT & SELECTION
-    # Sort by Score (Primary) and Rating (Secondary)
-    scored_matches.sort(key=lambda x: (x[0], x[1].get("rating", 0)), reverse=True)
-    
+        matrix, movies = self._matrix, self.movies
+        if matrix is None:
+            return [
+                self.score(query, favorites, limit=limit)
+                for query, favorites in zip(queries, favorites_list)
+            ]
+
+        return [
+            [(score, movies[movie_id]) for score, movie_id in ranked]
+            for ranked in matrix.score_batch(queries, favorites_list, k=limit)
+        ]
+
+    def recommend(self, user_query, user_favorites=None):
+        self.refresh()
+        if not self.movies:
+            return "Movie database is empty."
+
+        scored_matches = self.score(user_query, user_favorites, limit=TOP_CANDIDATES)
+        if not scored_matches:
+            return "I couldn't find a specific match. Try a mood like 'dark' or 'feel good'!"
+
+        user_favorites_set = set(f.lower() for f in (user_favorites or []))
+        return _format_recommendations(scored_matches, user_favorites_set)
+
+
+RECOMMENDER = MovieRecommender()
+
+
+def recommend(user_query, user_favorites=None):
+    """
+    Level 4 Recommendation Engine: Weighted Scoring & Precision Matching.
+    Fixed: Variable scope, Normalized ratings, and Threshold filtering.
+    Indexed: catalogue cached in RECOMMENDER, only candidate movies scored.
+    """
+    return RECOMMENDER.recommend(user_query, user_favorites)
+
+
+def _format_recommendations(scored_matches, user_favorites_set):
+    # 3. SELECTION
     # Selection: Shuffle top 5 candidates to provide variety
-    top_candidates = [item[1] for item in scored_matches[:5]]
+    top_candidates = [item[1] for item in scored_matches[:TOP_CANDIDATES]]
     random.shuffle(top_candidates)
     final_selection = top_candidates[:3]
 
@@ -37,7 +37,7 @@ def fetch_movie_info(user_query, history=None):
     # -----------------------------------------
     # 2️⃣ Internet Guard
     # -----------------------------------------
-    if not network.is_internet_allowed(mode="movie"):
+    if not network.is_internet_allowed(mode="movie", services=network.SEARCH_SERVICES):
         print("[Movie Lookup] Internet not available.")
         return "Internet access is unavailable."
 
@@ -0,0 +1,117 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from movie import title_matcher
+from utils import network, movie_db
+from web import movie_adapter
+
+
+# --- CONFIGURATION ---
+REFRESH_WORKERS = 2   # Background refreshes of stale rows
+FETCH_WAIT = 15       # Seconds a request waits on another thread's fetch of the same title
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="movie-refresh")
+_IN_FLIGHT = {}       # normalized query -> Future
+_LOCK = threading.Lock()
+
+
+def _key(query):
+    return " ".join(query.lower().split())
+
+
+def _fetch(query, refresh=False):
+    """
+    One TMDB lookup; saves hits and remembers definite misses.
+
+    refresh=True means `query` is the title of a stale cached row. If TMDB
+    answers with another title or nothing, that row is re-dated so it is
+    not refreshed again on every request (network errors leave it stale).
+    """
+    status, movie = movie_adapter.lookup_online_movie(query)
+
+    if status == movie_adapter.FOUND:
+        movie_db.save_movie_to_db(movie)
+        title_matcher.add_title(movie["title"])
+
+    if status == movie_adapter.MISSING:
+        print(f"[Resolver] TMDB has no match for '{query}'.")
+        movie_db.save_miss(query)
+
+    if refresh and status != movie_adapter.ERROR \
+            and (movie is None or movie["title"].casefold() != query.casefold()):
+        movie_db.touch_movie(query)
+
+    return movie if status == movie_adapter.FOUND else None
+
+
+def _fetch_once(query, background=False, refresh=False):
+    """
+    Fetches a title from TMDB, joining any fetch of the same title that
+    is already running instead of starting another one.
+
+    background=True returns immediately; otherwise returns the movie.
+    """
+    key = _key(query)
+
+    with _LOCK:
+        future = _IN_FLIGHT.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _IN_FLIGHT[key] = future
+
+    if not owner:
+        if background:
+            return None
+        try:
+            return future.result(timeout=FETCH_WAIT)
+        except Exception:
+            return None
+
+    def run():
+        try:
+            future.set_result(_fetch(query, refresh=refresh))
+        except Exception as e:
+            print(f"[Resolver Error] {e}")
+            future.set_result(None)
+        finally:
+            with _LOCK:
+                _IN_FLIGHT.pop(key, None)
+
+    if background:
+        _EXECUTOR.submit(run)
+        return None
+
+    run()
+    return future.result()
+
+
+def resolve(query):
+    """
+    Movie facts for a title: local cache first, then TMDB.
+
+    - Fresh row: returned.
+    - Stale row: returned immediately, refreshed in the background.
+    - Recent TMDB miss: None without going online.
+    - Otherwise: fetched online (if allowed) and cached.
+    """
+    if not query:
+        return None
+
+    entry = movie_db.get_movie_entry(query)
+
+    if entry:
+        movie, is_stale = entry
+        if is_stale and network.is_internet_allowed(mode="movie", silent=True):
+            print(f"[Resolver] Serving stale '{movie['title']}', refreshing in background.")
+            _fetch_once(movie["title"], background=True, refresh=True)
+        return movie
+
+    if movie_db.is_known_miss(query):
+        print(f"[Resolver] Known miss: '{query}'.")
+        return None
+
+    if not network.is_internet_allowed(mode="movie"):
+        return None
+
+    return _fetch_once(query)
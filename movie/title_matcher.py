@@ -0,0 +1,210 @@
+import difflib
+import re
+import threading
+from collections import defaultdict
+
+from movie import engine
+from utils import movie_db
+
+
+# --- CONFIGURATION ---
+FUZZY_CUTOFF = 0.82   # difflib ratio needed for a typo'd title to match
+
+# Chat filler around a title ("tell me about ... please")
+FILLER_WORDS = {
+    "a", "an", "the", "tell", "me", "about", "what", "whats", "is", "was",
+    "do", "you", "know", "movie", "film", "please", "pls", "plot", "of",
+    "info", "on", "details", "review", "rating", "cast", "who", "in",
+    "show", "give", "can", "could", "i", "want", "to", "watch", "it",
+    "story", "summary", "for", "and", "how", "good",
+    "hey", "hi", "hello", "yo", "bro"
+}
+
+# Tokens that tell sequels apart ("Iron Man 2" vs "Iron Man 3")
+NUMBER_PATTERN = re.compile(r"^(\d+|ii|iii|iv|v|vi|vii|viii|ix|x)$")
+
+TOKEN_PATTERN = re.compile(r"\w+")
+_END = "\0"
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+def content_words(tokens):
+    """Tokens that are not chat filler."""
+    return [token for token in tokens if token not in FILLER_WORDS]
+
+
+def _is_number(token):
+    return bool(NUMBER_PATTERN.match(token))
+
+
+def _same_words(title_tokens, tokens):
+    """
+    True if two token lists name the same title up to typos: every word
+    has a close counterpart on the other side and the numbers are equal.
+    """
+    if set(filter(_is_number, title_tokens)) != set(filter(_is_number, tokens)):
+        return False
+
+    words = [t for t in content_words(tokens) if not _is_number(t)]
+    title_words = [t for t in content_words(title_tokens) if not _is_number(t)]
+    return all(difflib.get_close_matches(w, title_words, n=1, cutoff=FUZZY_CUTOFF) for w in words) \
+        and all(difflib.get_close_matches(w, words, n=1, cutoff=FUZZY_CUTOFF) for w in title_words)
+
+
+def strip_filler(text):
+    """Drops filler words before and after the title, keeps inner words."""
+    tokens = tokenize(text)
+    start, end = 0, len(tokens)
+    while start < end and tokens[start] in FILLER_WORDS:
+        start += 1
+    while end > start and tokens[end - 1] in FILLER_WORDS:
+        end -= 1
+    return " ".join(tokens[start:end])
+
+
+class TitleMatcher:
+    """
+    Token trie over every known title (neon_movies.db + movie_db.json).
+
+    extract() walks the trie from each word of the message and keeps the
+    longest complete title, so "tell me about the dark knight rises" gives
+    "The Dark Knight Rises" without any database query. Messages with a
+    typo fall back to difflib over titles sharing a word prefix.
+
+    A match is only trusted when it is clearly what the message names:
+    a title with one meaningful word ("Hey", "GOAT") must cover most of
+    the message, and a title followed by a number or differing in one
+    ("The Housemaid 2", "Iron Man 3") is rejected. When unsure, extract()
+    returns None and callers fall back to the stripped message.
+
+    `titles` fixes the catalogue instead of loading both files (tests).
+    """
+
+    def __init__(self, titles=None):
+        self._trie = {}
+        self._titles = {}                   # normalized -> canonical title
+        self._prefixes = defaultdict(set)   # 2-letter word prefix -> normalized titles
+        self._loaded = False
+        self._lock = threading.Lock()
+
+        if titles is not None:
+            for title in titles:
+                self._add(title)
+            self._loaded = True
+
+    def _add(self, title):
+        tokens = tokenize(title)
+        if not tokens:
+            return
+
+        normalized = " ".join(tokens)
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(_END, title)
+
+        self._titles.setdefault(normalized, title)
+        for token in tokens:
+            self._prefixes[token[:2]].add(normalized)
+
+    def load(self):
+        """Builds the trie once from both catalogues."""
+        with self._lock:
+            if self._loaded:
+                return
+
+            titles = movie_db.get_all_titles()
+            titles += [movie.get("title", "") for movie in engine.load_db()]
+            for title in titles:
+                self._add(title)
+
+            self._loaded = True
+            print(f"[TitleMatcher] Indexed {len(self._titles)} titles.")
+
+    def add(self, title):
+        """Registers a title learned at runtime (e.g. fetched from TMDB)."""
+        self.load()
+        with self._lock:
+            self._add(title)
+
+    # -----------------------------
+    # Matching
+    # -----------------------------
+
+    def _trie_match(self, tokens):
+        content = content_words(tokens)
+        best, best_length = None, 0
+
+        for start in range(len(tokens)):
+            node = self._trie
+            for length, token in enumerate(tokens[start:], 1):
+                node = node.get(token)
+                if node is None:
+                    break
+                title = node.get(_END)
+                if title and length > best_length \
+                        and self._accept_span(tokens, start, length, content):
+                    best, best_length = title, length
+
+        return best
+
+    @staticmethod
+    def _accept_span(tokens, start, length, content):
+        span = tokens[start:start + length]
+        stop = start + length
+
+        # A title made only of filler ("It", "Up") must be the whole request
+        if all(t in FILLER_WORDS for t in span):
+            return length == len(tokens)
+
+        # "the housemaid 2" names a sequel, not "The Housemaid"
+        if stop < len(tokens) and _is_number(tokens[stop]):
+            return False
+
+        # A one-word title ("Hey", "GOAT") must be most of what is asked
+        span_content = content_words(span)
+        if len(span_content) < 2:
+            return len(span_content) * 2 > len(content)
+
+        return True
+
+    def _fuzzy_match(self, text):
+        if not text:
+            return None
+
+        candidates = set()
+        for token in text.split():
+            candidates |= self._prefixes.get(token[:2], set())
+        if not candidates:
+            return None
+
+        tokens = text.split()
+        for match in difflib.get_close_matches(text, list(candidates), n=3, cutoff=FUZZY_CUTOFF):
+            # Sequels and near-identical titles differ by a word, not a typo
+            if _same_words(match.split(), tokens):
+                return self._titles[match]
+
+        return None
+
+    def extract(self, message):
+        """Canonical title named in the message, or None."""
+        self.load()
+        tokens = tokenize(message)
+        if not tokens:
+            return None
+
+        return self._trie_match(tokens) or self._fuzzy_match(strip_filler(message))
+
+
+MATCHER = TitleMatcher()
+
+
+def extract_title(message):
+    return MATCHER.extract(message)
+
+
+def add_title(title):
+    MATCHER.add(title)
@@ -0,0 +1,184 @@
+from collections import defaultdict
+
+import numpy as np
+
+
+# --- CONFIGURATION ---
+BATCH_ROWS = 256   # Queries scored per block in score_batch (bounds memory)
+
+
+class CatalogueMatrix:
+    """
+    Columnar copy of the movie catalogue for vectorized scoring.
+
+        genres   (movies x genres)        multi-hot, bool
+        moods    (movies x moods)         multi-hot, bool
+        phrases  (movies x mood phrases)  movie has a genre the phrase implies
+        ratings  (movies,)                float64
+
+    Title words stay in an inverted index (word -> movie ids): the title
+    vocabulary grows with the catalogue, so a dense matrix would not.
+
+    Scores match movie/engine.py exactly: integer parts are summed first,
+    then rating * rating_weight is added, and ties are ordered by rating
+    and then catalogue position.
+    """
+
+    def __init__(self, movies, mood_map, keyword_score=5, mood_score=4,
+                 favorite_score=3, rating_weight=0.3, min_score=4):
+        self.keyword_score = keyword_score
+        self.mood_score = mood_score
+        self.favorite_score = favorite_score
+        self.rating_weight = rating_weight
+        self.min_score = min_score
+        self.mood_phrases = list(mood_map)
+
+        movie_genres = [set(g.lower() for g in movie.get("genre", [])) for movie in movies]
+        movie_moods = [set(m.lower() for m in movie.get("mood", [])) for movie in movies]
+
+        related = set(g for genres in mood_map.values() for g in genres)
+        self.genre_vocab = {
+            g: i for i, g in enumerate(sorted(set().union(*movie_genres, related)))
+        }
+        self.mood_vocab = {m: i for i, m in enumerate(sorted(set().union(*movie_moods)))}
+
+        n = len(movies)
+        self.genres = np.zeros((n, len(self.genre_vocab)), dtype=bool)
+        self.moods = np.zeros((n, len(self.mood_vocab)), dtype=bool)
+
+        title_index = defaultdict(list)
+        for movie_id, movie in enumerate(movies):
+            for g in movie_genres[movie_id]:
+                self.genres[movie_id, self.genre_vocab[g]] = True
+            for m in movie_moods[movie_id]:
+                self.moods[movie_id, self.mood_vocab[m]] = True
+            for word in set(movie.get("title", "").lower().split()):
+                title_index[word].append(movie_id)
+
+        self.title_index = {
+            word: np.asarray(ids, dtype=np.int64) for word, ids in title_index.items()
+        }
+
+        phrase_genres = np.zeros((len(self.genre_vocab), len(self.mood_phrases)), dtype=np.float32)
+        for p, phrase in enumerate(self.mood_phrases):
+            for g in mood_map[phrase]:
+                phrase_genres[self.genre_vocab[g], p] = 1
+        self.phrases = (self.genres.astype(np.float32) @ phrase_genres) > 0
+
+        self.ratings = np.asarray(
+            [float(movie.get("rating") or 0) for movie in movies], dtype=np.float64
+        )
+
+        # float32 copies for the matrix products
+        self._genres_t = self.genres.T.astype(np.float32)
+        self._moods_t = self.moods.T.astype(np.float32)
+        self._phrases_t = self.phrases.T.astype(np.float32)
+
+    def __len__(self):
+        return len(self.ratings)
+
+    # -----------------------------
+    # Scoring
+    # -----------------------------
+
+    def _encode(self, queries, favorites_list):
+        """Turns a block of queries into one-hot rows over the vocabularies."""
+        rows = len(queries)
+        query_genres = np.zeros((rows, len(self.genre_vocab)), dtype=np.float32)
+        query_moods = np.zeros((rows, len(self.mood_vocab)), dtype=np.float32)
+        query_phrases = np.zeros((rows, len(self.mood_phrases)), dtype=np.float32)
+        favorite_genres = np.zeros((rows, len(self.genre_vocab)), dtype=np.float32)
+        title_hits = []
+
+        for row, (query, favorites) in enumerate(zip(queries, favorites_list)):
+            query_lower = query.lower().strip()
+            hits = []
+
+            for word in set(query_lower.split()):
+                if word in self.genre_vocab:
+                    query_genres[row, self.genre_vocab[word]] = 1
+                if word in self.mood_vocab:
+                    query_moods[row, self.mood_vocab[word]] = 1
+                if word in self.title_index:
+                    hits.append(self.title_index[word])
+
+            for p, phrase in enumerate(self.mood_phrases):
+                if phrase in query_lower:
+                    query_phrases[row, p] = 1
+
+            for favorite in favorites or []:
+                g = self.genre_vocab.get(favorite.lower())
+                if g is not None:
+                    favorite_genres[row, g] = 1
+
+            title_hits.append(hits)
+
+        return query_genres, query_moods, query_phrases, favorite_genres, title_hits
+
+    def _score_block(self, queries, favorites_list):
+        """(queries x movies) float64 scores for one block."""
+        query_genres, query_moods, query_phrases, favorite_genres, title_hits = \
+            self._encode(queries, favorites_list)
+
+        # A. Direct Keyword Match (+5, once per movie)
+        keyword = (query_genres @ self._genres_t > 0) | (query_moods @ self._moods_t > 0)
+        for row, hits in enumerate(title_hits):
+            for ids in hits:
+                keyword[row, ids] = True
+
+        # B. Phrase-based Mood Match (+4 per matched phrase)
+        mood_matches = query_phrases @ self._phrases_t
+
+        # C. User Preference Alignment (+3)
+        favorite = favorite_genres @ self._genres_t > 0
+
+        scores = (
+            keyword * self.keyword_score
+            + mood_matches * self.mood_score
+            + favorite * self.favorite_score
+        ).astype(np.float64)
+
+        # D. Quality Weight
+        scores += self.ratings * self.rating_weight
+        return scores
+
+    def _select(self, scores, k):
+        """Movie ids above the threshold, best first, at most k."""
+        passing = np.flatnonzero(scores >= self.min_score)
+
+        if k is not None and len(passing) > k:
+            # Keep everything tied with the k-th best score, then order exactly
+            top = np.argpartition(-scores[passing], k - 1)[:k]
+            kth = scores[passing[top]].min()
+            passing = passing[scores[passing] >= kth]
+
+        order = np.lexsort((passing, -self.ratings[passing], -scores[passing]))
+        selected = passing[order]
+        return selected[:k] if k is not None else selected
+
+    def top_k(self, query, favorites=None, k=None):
+        """[(score, movie_id)] above the threshold for one query, best first."""
+        if not len(self):
+            return []
+        scores = self._score_block([query], [favorites])[0]
+        return [(float(scores[i]), int(i)) for i in self._select(scores, k)]
+
+    def score_batch(self, queries, favorites_list=None, k=5):
+        """
+        top_k for many queries (or users) at once, for offline jobs.
+        Scores BATCH_ROWS queries per matrix product.
+        """
+        favorites_list = favorites_list or [None] * len(queries)
+        if not len(self):
+            return [[] for _ in queries]
+
+        results = []
+        for start in range(0, len(queries), BATCH_ROWS):
+            block = self._score_block(
+                queries[start:start + BATCH_ROWS],
+                favorites_list[start:start + BATCH_ROWS]
+            )
+            for scores in block:
+                results.append([(float(scores[i]), int(i)) for i in self._select(scores, k)])
+
+        return results
@@ -0,0 +1,265 @@
+import sys
+import os
+import argparse
+import json
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import zlib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from exam import indexer, retriever, store, embeddings, bm25, compressor, query_cache
+from exam.embedding_cache import EmbeddingCache
+
+# (chunk_size, overlap) pairs to compare; (500, 75) is the production default
+CHUNKING_STRATEGIES = [(300, 50), (500, 75), (800, 120)]
+RETRIEVERS = ["dense", "bm25", "hybrid"]
+STUB_DIM = 256
+
+SUBJECTS = ["Thermodynamics", "Optics", "Genetics", "Microeconomics", "Algorithms",
+            "Electrostatics", "Ecology", "Organic Chemistry", "Statistics", "Databases"]
+FILLER = [
+    "This topic is examined in the final paper.",
+    "Students should revise the worked examples at the end of the unit.",
+    "Diagrams in this section are not to scale.",
+    "Refer to the laboratory manual for safety guidance.",
+    "The following paragraphs summarise the key ideas.",
+]
+
+
+# -----------------------------
+# Offline Embedding Stub
+# -----------------------------
+
+class StubEmbeddingFunction:
+    """
+    Deterministic hashing-trick embedding (terms + character trigrams).
+    Needs no model download, so the benchmark runs fully offline. Follows
+    Chroma's embedding-function protocol and returns unit vectors, like the
+    real model it replaces (Chroma ranks by raw L2 distance).
+    """
+
+    def __init__(self, dim=STUB_DIM):
+        self.dim = dim
+
+    def __call__(self, input):
+        vectors = []
+        for text in input:
+            vector = [0.0] * self.dim
+            for term in bm25.tokenize(text):
+                vector[zlib.crc32(term.encode()) % self.dim] += 1.0
+                for i in range(len(term) - 2):
+                    vector[zlib.crc32(term[i:i + 3].encode()) % self.dim] += 0.3
+            norm = sum(v * v for v in vector) ** 0.5 or 1.0
+            vectors.append([v / norm for v in vector])
+        return vectors
+
+
+# -----------------------------
+# Synthetic Syllabus
+# -----------------------------
+
+def build_corpus(pages=120, facts_per_page=3, seed=7):
+    """
+    Returns (pages, qa_pairs). Every fact sentence is unique and has one
+    question whose answer passage is that sentence.
+    """
+    rng = random.Random(seed)
+    page_texts = []
+    qa_pairs = []
+
+    for page_no in range(pages):
+        subject = SUBJECTS[page_no % len(SUBJECTS)]
+        lines = [f"Chapter {page_no // 10 + 1}. {subject}."]
+
+        for fact_no in range(facts_per_page):
+            section = f"{page_no // 10 + 1}.{page_no % 10 + 1}.{fact_no + 1}"
+            term = f"{rng.choice(['Kessler', 'Varga', 'Okafor', 'Lindqvist', 'Moreau'])}-{page_no * facts_per_page + fact_no}"
+            fact = (
+                f"Section {section} defines the {term} principle of {subject.lower()}, "
+                f"which states that quantity {rng.randint(2, 99)} is conserved under {rng.choice(['pressure', 'rotation', 'selection', 'recursion'])}."
+            )
+            lines.append(fact)
+            lines.extend(rng.sample(FILLER, 2))
+            qa_pairs.append({"question": f"What does the {term} principle state?", "answer": fact})
+
+        page_texts.append(" ".join(lines))
+
+    return page_texts, qa_pairs
+
+
+# -----------------------------
+# Harness
+# -----------------------------
+
+def _configure(work_dir, backend, embed_fn, model_name):
+    """Points the exam store and caches at a throwaway directory."""
+    store.BACKEND = backend
+    store.DB_DIR = work_dir
+    store.NUMPY_DIR = os.path.join(work_dir, "numpy")
+    store.ACTIVE_FILE = os.path.join(work_dir, "active_collections.json")
+    store.reset_client()
+
+    embeddings._EMBEDDING_FUNC = embed_fn
+    embeddings.MODEL_NAME = model_name
+    embeddings.CACHE = EmbeddingCache(path=os.path.join(work_dir, "embedding_cache.sqlite3"))
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def ingest(pages, chunk_size, overlap, collection_name, batch_size=indexer.EMBED_BATCH_SIZE):
+    """Runs the indexer's streaming stages into a fresh collection."""
+    started = time.perf_counter()
+    physical_name = f"{collection_name}_{chunk_size}_{overlap}"
+    collection = store.create_collection(physical_name)
+
+    chunks = indexer.iter_chunks(
+        (indexer.normalize_text(page) for page in pages),
+        chunk_size=chunk_size,
+        overlap=overlap
+    )
+
+    seen = set()
+    count = 0
+    for batch in indexer.iter_batches(chunks, batch_size):
+        batch = [chunk for chunk in batch if indexer.chunk_id("bench", chunk) not in seen]
+        seen.update(indexer.chunk_id("bench", chunk) for chunk in batch)
+        if not batch:
+            continue
+        collection.add(
+            ids=[indexer.chunk_id("bench", chunk) for chunk in batch],
+            embeddings=embeddings.embed_texts(batch),
+            documents=batch,
+            metadatas=[{"source": "bench", "mode": "exam"} for _ in batch]
+        )
+        count += len(batch)
+
+    bm25.build_index(physical_name, collection)
+    store.set_active_name(collection_name, physical_name)
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    return {
+        "chunks": count,
+        "ingest_seconds": round(elapsed, 4),
+        "pages_per_sec": round(len(pages) / elapsed, 1),
+        "chunks_per_sec": round(count / elapsed, 1),
+    }
+
+
+def evaluate(qa_pairs, mode, collection_name, k):
+    """Query latency, recall@k and prompt-token counts for one retriever mode."""
+    retriever.HYBRID = mode != "dense"
+    handle = retriever.Retriever(collection_name)
+    latencies, hits_at_k, raw_tokens, compressed_tokens = [], 0, [], []
+
+    for pair in qa_pairs:
+        query_cache.QUERY_CACHE.clear()
+        started = time.perf_counter()
+
+        if mode == "bm25":
+            collection = handle._get_collection()
+            index = bm25.get_index(handle._physical_name, collection)
+            documents = [index.documents[doc_id] for doc_id, _, _ in index.search(pair["question"], k=k)]
+        else:
+            hits = handle.search(pair["question"], n_results=k) or {}
+            documents = hits.get("documents", [])
+
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        if any(pair["answer"][:80] in document for document in documents):
+            hits_at_k += 1
+
+        context = compressor.CHUNK_SEPARATOR.join(documents)
+        raw_tokens.append(compressor.estimate_tokens(context) if context else 0)
+        compressed = compressor.compress_context(
+            pair["question"],
+            context,
+            query_embedding=retriever.get_query_embedding(pair["question"], collection_name)
+        ) if context else ""
+        compressed_tokens.append(compressor.estimate_tokens(compressed) if compressed else 0)
+
+    return {
+        "recall_at_k": round(hits_at_k / len(qa_pairs), 3),
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "prompt_tokens_raw": round(statistics.mean(raw_tokens), 1),
+        "prompt_tokens_compressed": round(statistics.mean(compressed_tokens), 1),
+    }
+
+
+def run_benchmark(pages=120, questions=200, k=3, backends=("numpy",), model=None, seed=7):
+    page_texts, qa_pairs = build_corpus(pages=pages, seed=seed)
+    qa_pairs = random.Random(seed).sample(qa_pairs, min(questions, len(qa_pairs)))
+
+    if model:
+        from chromadb.utils import embedding_functions
+        embed_fn = embedding_functions.SentenceTransformerEmbeddingFunction(model_name=model)
+        model_name = model
+    else:
+        embed_fn, model_name = StubEmbeddingFunction(), "stub-hash"
+
+    results = []
+    saved_hybrid = retriever.HYBRID
+
+    for backend in backends:
+        for chunk_size, overlap in CHUNKING_STRATEGIES:
+            work_dir = tempfile.mkdtemp(prefix="neon_bench_")
+            try:
+                _configure(work_dir, backend, embed_fn, model_name)
+                ingest_stats = ingest(page_texts, chunk_size, overlap, "bench_syllabus")
+
+                for mode in RETRIEVERS:
+                    row = {
+                        "backend": backend,
+                        "chunking": f"{chunk_size}/{overlap}",
+                        "retriever": mode,
+                        **ingest_stats,
+                        **evaluate(qa_pairs, mode, "bench_syllabus", k),
+                    }
+                    results.append(row)
+                    print(
+                        f"[Benchmark] {backend:<6} {row['chunking']:<8} {mode:<6} "
+                        f"recall@{k}={row['recall_at_k']:.3f} "
+                        f"p50={row['p50_ms']:.2f}ms p95={row['p95_ms']:.2f}ms "
+                        f"tokens={row['prompt_tokens_raw']:.0f}->{row['prompt_tokens_compressed']:.0f} "
+                        f"ingest={row['chunks_per_sec']:.0f} chunks/s"
+                    )
+            finally:
+                store.reset_client()
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    retriever.HYBRID = saved_hybrid
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exam retrieval benchmark (offline).")
+    parser.add_argument("--pages", type=int, default=120)
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument("--backends", default="numpy", help="Comma list: numpy,chroma")
+    parser.add_argument("--model", default=None,
+                        help="Local sentence-transformers model; default is a deterministic stub.")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write results to this file.")
+    args = parser.parse_args()
+
+    rows = run_benchmark(
+        pages=args.pages,
+        questions=args.questions,
+        k=args.k,
+        backends=[b.strip() for b in args.backends.split(",") if b.strip()],
+        model=args.model
+    )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=4)
+        print(f"[Benchmark] Results written to {args.json_path}")
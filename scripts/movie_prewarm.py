@@ -0,0 +1,153 @@
+import sys
+import os
+import argparse
+import json
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from web import movie_adapter
+from utils import movie_db
+from movie import engine
+
+CHECKPOINT_PATH = os.path.join(os.path.dirname(__file__), '..', 'utils', 'neon_movies.prewarm.json')
+CHUNK_SIZE = 100   # Titles resolved and committed per step (checkpoint granularity)
+WORKERS = 8        # Concurrent TMDB lookups (shared rate limit)
+
+
+def load_titles(titles_file=None, titles=None):
+    """
+    Titles from the command line, a file (one per line, '#' comments),
+    or every title in movie/movie_db.json. Duplicates are dropped.
+    """
+    if titles:
+        raw = titles
+    elif titles_file:
+        with open(titles_file, 'r', encoding='utf-8') as f:
+            raw = [line for line in f if not line.lstrip().startswith("#")]
+    else:
+        raw = [m.get("title", "") for m in engine.load_db()]
+
+    unique = {}
+    for title in raw:
+        title = " ".join(str(title).split())
+        if title:
+            unique.setdefault(title.casefold(), title)
+    return list(unique.values())
+
+
+def _load_checkpoint(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return set(json.load(f).get("done", []))
+    except (FileNotFoundError, ValueError):
+        return set()
+
+
+def _save_checkpoint(path, done):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"done": sorted(done), "updated": time.time()}, f)
+    os.replace(tmp_path, path)
+
+
+def _is_fresh(title):
+    """True if this exact title is cached and not yet stale."""
+    entry = movie_db.get_movie_entry(title)
+    if not entry:
+        return False
+    movie, is_stale = entry
+    return not is_stale and movie["title"].casefold() == title.casefold()
+
+
+def prewarm(titles, workers=WORKERS, chunk_size=CHUNK_SIZE, checkpoint_path=CHECKPOINT_PATH, force=False):
+    """
+    Resolves titles through the TMDB client's bulk API and writes each
+    chunk in one transaction. Progress is checkpointed per chunk, so an
+    interrupted run resumes where it stopped; the checkpoint is removed
+    once a run finishes without errors.
+    """
+    print(f"\n[Admin Tool] Pre-warming movie cache: {len(titles)} titles.")
+
+    done = set() if force else _load_checkpoint(checkpoint_path)
+    pending = [t for t in titles if t.casefold() not in done]
+    if len(pending) < len(titles):
+        print(f"[Admin Tool] Resuming: {len(titles) - len(pending)} titles already done.")
+
+    if not force:
+        fresh = [t for t in pending if _is_fresh(t) or movie_db.is_known_miss(t)]
+        if fresh:
+            print(f"[Admin Tool] Skipping {len(fresh)} titles with fresh rows or recent misses.")
+            fresh_keys = set(t.casefold() for t in fresh)
+            pending = [t for t in pending if t.casefold() not in fresh_keys]
+
+    stats = {"found": 0, "missing": 0, "errors": 0}
+    started = time.perf_counter()
+
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        results = movie_adapter.bulk_lookup_movies(chunk, workers=workers)
+
+        found = [movie for status, movie in results.values() if status == movie_adapter.FOUND]
+        misses = [query for query, (status, _) in results.items() if status == movie_adapter.MISSING]
+        errors = [query for query, (status, _) in results.items() if status == movie_adapter.ERROR]
+
+        # Failed lookups and failed writes stay pending so a rerun retries them
+        if movie_db.save_movies_to_db(found, misses) is None:
+            stats["errors"] += len(chunk)
+        else:
+            error_keys = set(q.casefold() for q in errors)
+            done.update(t.casefold() for t in chunk if t.casefold() not in error_keys)
+            _save_checkpoint(checkpoint_path, done)
+
+            stats["found"] += len(found)
+            stats["missing"] += len(misses)
+            stats["errors"] += len(errors)
+
+        processed = start + len(chunk)
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        print(
+            f"[Admin Tool] {processed}/{len(pending)} titles "
+            f"({processed / elapsed:.1f} titles/s) | "
+            f"found {stats['found']} · missing {stats['missing']} · errors {stats['errors']}"
+        )
+
+    elapsed = time.perf_counter() - started
+
+    if stats["errors"] == 0 and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    print(
+        f"\n[Admin Tool] Pre-warm complete in {elapsed:.1f}s. "
+        f"Cached: {stats['found']} | Missing: {stats['missing']} | Errors: {stats['errors']}"
+    )
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-populate neon_movies.db from TMDB.")
+    parser.add_argument("titles", nargs="*", help="Titles to resolve (default: movie/movie_db.json).")
+    parser.add_argument("--file", dest="titles_file", help="Text file with one title per line.")
+    parser.add_argument("--api-key", default=os.environ.get("TMDB_API_KEY"))
+    parser.add_argument("--base-url", default=None, help="TMDB API base URL (e.g. a local fake server).")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    parser.add_argument("--force", action="store_true", help="Ignore checkpoint, fresh rows and misses.")
+    args = parser.parse_args()
+
+    if not args.api_key:
+        print("[Admin Tool] TMDB API key required (--api-key or TMDB_API_KEY).")
+        sys.exit(1)
+
+    movie_adapter.set_api_key(args.api_key)
+    if args.base_url:
+        movie_adapter.CLIENT.base_url = args.base_url.rstrip("/")
+
+    prewarm(
+        load_titles(args.titles_file, args.titles),
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        checkpoint_path=args.checkpoint,
+        force=args.force
+    )
@@ -1,12 +1,16 @@
-from web import search_adapter, movie_adapter
-from exam import indexer
+from web import search_adapter, movie_adapter, poster_cache
+from exam import indexer, embeddings, jobs
 from brain import waterfall, memory
+from models import local_llm, context_store
+from utils import network
 import os
 import re
+import json
 import sys
 import time  # 1️⃣ Added time module
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, jsonify, render_template, send_file
 from flask_cors import CORS
+from werkzeug.utils import secure_filename
 from pyngrok import ngrok
 
 
@@ -38,6 +42,10 @@ USER_FACTS = {}
 
 ALLOWED_MODES = {"casual", "exam", "movie", "coding"}
 
+# Preload the exam embedding model in the background after startup.
+# Leave off for deployments that rarely use exam mode (it loads on first use).
+WARM_EXAM_EMBEDDINGS = False
+
 
 # -----------------------------
 # HELPERS
@@ -164,16 +172,33 @@ def upload_pdf():
     if not file.filename:
         return jsonify({"status": "error", "message": "Empty filename"}), 400
     try:
-        upload_dir = os.path.join("exam", "uploads")
-        os.makedirs(upload_dir, exist_ok=True)
-        filepath = os.path.join(upload_dir, "syllabus.pdf")
+        # Each PDF keeps its own name so several syllabi can share the index
+        filename = secure_filename(file.filename) or "syllabus.pdf"
+        if not filename.lower().endswith(".pdf"):
+            filename += ".pdf"
+
+        os.makedirs(indexer.UPLOAD_DIR, exist_ok=True)
+        filepath = os.path.join(indexer.UPLOAD_DIR, filename)
         file.save(filepath)
-        success, msg = indexer.process_pdf("syllabus.pdf")
-        return jsonify({"status": "success" if success else "error", "message": msg})
+
+        # Parsing and embedding run on the ingestion pool
+        job_id = jobs.submit(filename)
+        if not job_id:
+            return jsonify({"status": "error", "message": "Ingestion queue is full. Try again later."}), 429
+
+        return jsonify({"status": "queued", "job_id": job_id, "message": "PDF queued for indexing."}), 202
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
+@app.route("/ingest-status/<job_id>", methods=["GET"])
+def ingest_status(job_id):
+    job = jobs.get_status(job_id)
+    if not job:
+        return jsonify({"status": "error", "message": "Unknown job id"}), 404
+    return jsonify(job)
+
+
 @app.route("/reset-exam-db", methods=["POST"])
 def reset_exam_db_endpoint():
     try:
@@ -207,93 +232,166 @@ def set_tmdb_key_endpoint():
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
-@app.route("/chat", methods=["POST"])
-def chat():
-    global HISTORY, USER_FACTS  # Using the dictionary now
+@app.route("/poster/<poster_id>", methods=["GET"])
+def poster(poster_id):
+    """
+    Local poster proxy: each TMDB poster is fetched once, kept on disk
+    (thumb/full buckets) and served with long-lived cache headers.
+    """
+    result = poster_cache.CACHE.get(poster_id, request.args.get("size", "full"))
+    if not result:
+        return jsonify({"status": "error", "message": "Poster not available"}), 404
+
+    path, bucket = result
+    etag = poster_cache.PosterCache.etag(bucket, poster_id)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={poster_cache.MAX_AGE}, immutable"
+    }
 
-    # 3️⃣ Start Timer
-    start_time = time.time()
+    if etag in request.headers.get("If-None-Match", ""):
+        return Response(status=304, headers=headers)
 
-    try:
-        data = request.get_json(silent=True) or {}
-        user_text = data.get("message", "").strip()
-        mode = data.get("mode", "casual").lower().strip()
+    response = send_file(path, etag=False, conditional=False)
+    response.headers.update(headers)
+    return response
 
-        if not user_text:
-            return jsonify({"error": "Empty message"}), 400
 
-        if mode not in ALLOWED_MODES:
-            return jsonify({"error": "Invalid mode"}), 400
+def _parse_chat_request():
+    """
+    Reads and validates the chat payload.
+    Returns (user_text, mode, error_response).
+    """
+    data = request.get_json(silent=True) or {}
+    user_text = data.get("message", "").strip()
+    mode = data.get("mode", "casual").lower().strip()
 
-        clean_lower = user_text.lower()
+    if not user_text:
+        return user_text, mode, (jsonify({"error": "Empty message"}), 400)
 
-        # --- LEVEL 2 INTELLIGENCE ---
+    if mode not in ALLOWED_MODES:
+        return user_text, mode, (jsonify({"error": "Invalid mode"}), 400)
 
-        # 1. Pure Math
-        if mode == "casual" and detect_pure_math(user_text):
-            try:
-                result = eval(user_text)
-                print(f"🧮 Pure Math: {user_text} = {result}")
-                
-                # Calculate time even for direct math
-                response_time = round(time.time() - start_time, 3)
-                print(f"⚡ Route: math_direct | Time: {response_time}s")
+    return user_text, mode, None
 
-                return jsonify({
-                    "response": str(result),
-                    "mode_used": "math_direct",
-                    "mode": mode,
-                    "response_time": response_time
-                })
-            except:
-                pass
-
-        # 2. Smart Coding Switch
-        if mode == "casual" and detect_coding_intent(user_text):
-            print(f"⚙️ Smart Switch: casual -> coding")
-            mode = "coding"
-
-        # --- MEMORY OPERATIONS ---
-        if mode != "exam" and ("i like" in clean_lower or "i love" in clean_lower):
-            genres = ["action", "sci-fi", "comedy", "horror", "drama", "romance", "adventure", "thriller"]
-            detected = [g for g in genres if g in clean_lower]
-            if detected:
-                for g in detected:
-                    memory.update_preference(g, mode="movie")
-                
-                response_time = round(time.time() - start_time, 3)
-                return jsonify({
-                    "response": f"I have noted that you like {', '.join(detected)} movies.",
-                    "mode_used": "preference_learning",
-                    "response_time": response_time
-                })
-
-        # Name Logic
-        if "my name is" in clean_lower:
-            match = re.search(r"my name is\s+(\w+)", clean_lower)
-            if match:
-                name = match.group(1).capitalize()
-                USER_FACTS["name"] = name
-                response_time = round(time.time() - start_time, 3)
-                return jsonify({
-                    "response": f"I will call you {name}.",
-                    "mode_used": "memory_learn",
-                    "response_time": response_time
-                })
 
-        if any(q in clean_lower for q in ["who am i", "what is my name"]):
+def _direct_reply(user_text, mode, start_time):
+    """
+    Handles routes that never reach the LLM (math, preferences, name memory).
+    Returns (mode, payload) where payload is None if the waterfall must run.
+    """
+    clean_lower = user_text.lower()
+
+    # --- LEVEL 2 INTELLIGENCE ---
+
+    # 1. Pure Math
+    if mode == "casual" and detect_pure_math(user_text):
+        try:
+            result = eval(user_text)
+            print(f"🧮 Pure Math: {user_text} = {result}")
+
+            # Calculate time even for direct math
             response_time = round(time.time() - start_time, 3)
-            if "name" in USER_FACTS:
-                return jsonify({
-                    "response": f"Your name is {USER_FACTS['name']}.",
-                    "mode_used": "memory_recall",
-                    "response_time": response_time
-                })
-            return jsonify({
-                "response": "I do not know your name yet.",
-                "mode_used": "memory_fail",
+            print(f"⚡ Route: math_direct | Time: {response_time}s")
+
+            return mode, {
+                "response": str(result),
+                "mode_used": "math_direct",
+                "mode": mode,
+                "response_time": response_time
+            }
+        except:
+            pass
+
+    # 2. Smart Coding Switch
+    if mode == "casual" and detect_coding_intent(user_text):
+        print(f"⚙️ Smart Switch: casual -> coding")
+        mode = "coding"
+
+    # --- MEMORY OPERATIONS ---
+    if mode != "exam" and ("i like" in clean_lower or "i love" in clean_lower):
+        genres = ["action", "sci-fi", "comedy", "horror", "drama", "romance", "adventure", "thriller"]
+        detected = [g for g in genres if g in clean_lower]
+        if detected:
+            for g in detected:
+                memory.update_preference(g, mode="movie")
+
+            response_time = round(time.time() - start_time, 3)
+            return mode, {
+                "response": f"I have noted that you like {', '.join(detected)} movies.",
+                "mode_used": "preference_learning",
+                "response_time": response_time
+            }
+
+    # Name Logic
+    if "my name is" in clean_lower:
+        match = re.search(r"my name is\s+(\w+)", clean_lower)
+        if match:
+            name = match.group(1).capitalize()
+            USER_FACTS["name"] = name
+            response_time = round(time.time() - start_time, 3)
+            return mode, {
+                "response": f"I will call you {name}.",
+                "mode_used": "memory_learn",
                 "response_time": response_time
-            })
+            }
+
+    if any(q in clean_lower for q in ["who am i", "what is my name"]):
+        response_time = round(time.time() - start_time, 3)
+        if "name" in USER_FACTS:
+            return mode, {
+                "response": f"Your name is {USER_FACTS['name']}.",
+                "mode_used": "memory_recall",
+                "response_time": response_time
+            }
+        return mode, {
+            "response": "I do not know your name yet.",
+            "mode_used": "memory_fail",
+            "response_time": response_time
+        }
+
+    return mode, None
+
+
+def _finalize_response(raw_response, mode):
+    """Applies server-side cleanup to a complete waterfall answer."""
+    final_response = sanitize_english(raw_response)
+
+    if mode == "coding":
+        final_response = enforce_code_formatting(final_response, mode)
+
+    return final_response
+
+
+def _remember_turn(mode, user_text, final_response):
+    """5️⃣ Update Isolated History"""
+    HISTORY[mode].append({"role": "user", "content": user_text})
+    HISTORY[mode].append({"role": "assistant", "content": final_response})
+
+    if len(HISTORY[mode]) > MAX_HISTORY:
+        HISTORY[mode] = HISTORY[mode][-MAX_HISTORY:]
+
+
+def _stream_cleaner(text):
+    """Token-stream cleaner: model sanitizer followed by the English filter."""
+    return sanitize_english(local_llm.sanitize_output(text))
+
+
+@app.route("/chat", methods=["POST"])
+def chat():
+    global HISTORY, USER_FACTS  # Using the dictionary now
+
+    # 3️⃣ Start Timer
+    start_time = time.time()
+
+    try:
+        user_text, mode, error = _parse_chat_request()
+        if error:
+            return error
+
+        mode, payload = _direct_reply(user_text, mode, start_time)
+        if payload:
+            return jsonify(payload)
 
         # --- WATERFALL EXECUTION ---
         # 4️⃣ Pass Isolated History based on Mode
@@ -305,17 +403,8 @@ def chat():
             history=current_history  # Only passing specific history
         )
 
-        final_response = sanitize_english(raw_response)
-
-        if mode == "coding":
-            final_response = enforce_code_formatting(final_response, mode)
-
-        # 5️⃣ Update Isolated History
-        HISTORY[mode].append({"role": "user", "content": user_text})
-        HISTORY[mode].append({"role": "assistant", "content": final_response})
-
-        if len(HISTORY[mode]) > MAX_HISTORY:
-            HISTORY[mode] = HISTORY[mode][-MAX_HISTORY:]
+        final_response = _finalize_response(raw_response, mode)
+        _remember_turn(mode, user_text, final_response)
 
         # 6️⃣ Calculate Time & Log
         response_time = round(time.time() - start_time, 3)
@@ -333,6 +422,71 @@ def chat():
         return jsonify({"error": "Internal server error."}), 500
 
 
+@app.route("/chat-stream", methods=["POST"])
+def chat_stream():
+    """
+    Streaming variant of /chat (newline-delimited JSON).
+
+    Events:
+        {"type": "token", "text": ..., "ttft": ...}  (ttft on the first token)
+        {"type": "done", "response": ..., "mode_used": ..., "ttft": ..., "response_time": ...}
+        {"type": "error", "error": ...}
+    """
+    start_time = time.time()
+
+    user_text, mode, error = _parse_chat_request()
+    if error:
+        return error
+
+    mode, payload = _direct_reply(user_text, mode, start_time)
+    if payload:
+        payload["type"] = "done"
+        return Response(json.dumps(payload) + "\n", mimetype="application/x-ndjson")
+
+    current_history = list(HISTORY[mode])
+
+    def generate():
+        ttft = None
+
+        try:
+            for kind, text in waterfall.stream_waterfall(
+                user_text,
+                mode=mode,
+                history=current_history,
+                clean_fn=_stream_cleaner
+            ):
+                if kind == "token":
+                    event = {"type": "token", "text": text}
+                    if ttft is None:
+                        ttft = round(time.time() - start_time, 3)
+                        event["ttft"] = ttft
+                    yield json.dumps(event) + "\n"
+                    continue
+
+                final_response = _finalize_response(text, mode)
+                _remember_turn(mode, user_text, final_response)
+
+                response_time = round(time.time() - start_time, 3)
+                if ttft is None:
+                    ttft = response_time
+                print(f"⚡ Route: {mode} (stream) | TTFT: {ttft}s | Time: {response_time}s")
+
+                yield json.dumps({
+                    "type": "done",
+                    "response": final_response,
+                    "mode_used": mode,
+                    "mode": mode,
+                    "ttft": ttft,
+                    "response_time": response_time
+                }) + "\n"
+
+        except Exception as e:
+            print("[SERVER ERROR]", e)
+            yield json.dumps({"type": "error", "error": "Internal server error."}) + "\n"
+
+    return Response(generate(), mimetype="application/x-ndjson")
+
+
 @app.route("/reset", methods=["POST"])
 def reset():
     global HISTORY
@@ -343,6 +497,7 @@ def reset():
         "movie": [],
         "coding": []
     }
+    context_store.invalidate()
     return jsonify({"status": "All conversation memories cleared."})
 
 
@@ -370,6 +525,13 @@ if __name__ == "__main__":
     else:
         print("Ngrok not configured. Running locally.")
 
+    # Keep Ollama health state fresh so requests never probe inline
+    local_llm.CLIENT.start_prober()
+    network.MONITOR.start(wait_ready=False)
+
+    if WARM_EXAM_EMBEDDINGS:
+        embeddings.warm_up_async()
+
     print("Local URL: http://localhost:5000")
     print("---------------------------------------------------")
 
@@ -532,7 +532,7 @@ async function loadTrendingMovies() {
       const cardsHTML = data.results
         .map((m, index) => {
           const posterUrl = m.poster_path
-            ? `https://image.tmdb.org/t/p/w500${m.poster_path}`
+            ? posterFromPath(m.poster_path, "thumb")
             : "https://via.placeholder.com/500x750?text=No+Poster";
           return `<div class="movie-card-placeholder" onclick="openMovieDetails(${index}, event)"><img src="${posterUrl}" alt="${m.title}" onerror="this.src='https://via.placeholder.com/500x750?text=Error'"><div class="card-overlay"><span class="card-text">${m.title}</span></div></div>`;
         })
@@ -593,7 +593,7 @@ function openMovieDetails(index, event) {
 
   setTimeout(() => {
     const poster = movie.poster_path
-      ? `https://image.tmdb.org/t/p/w500${movie.poster_path}`
+      ? posterFromPath(movie.poster_path, "full")
       : null;
     const year = movie.release_date
       ? new Date(movie.release_date).getFullYear()
@@ -788,7 +788,7 @@ async function sendMessage() {
       addMsg(
         "Here is a demo poster for testing.",
         "assistant",
-        "https://image.tmdb.org/t/p/w500/qJ2tW6WMUDux911r6m7haRef0WH.jpg",
+        "/poster/qJ2tW6WMUDux911r6m7haRef0WH.jpg",
       );
     }, 1500);
     return;
@@ -797,7 +797,7 @@ async function sendMessage() {
   const startTime = performance.now();
 
   try {
-    const res = await fetch("/chat", {
+    const res = await fetch("/chat-stream", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({
@@ -806,22 +806,22 @@ async function sendMessage() {
       }),
     });
 
-    const data = await res.json();
-    setThinkingState(false);
-
-    const endTime = performance.now();
-    const latency = ((endTime - startTime) / 1000).toFixed(2) + "s";
-
-    if (data.error) {
-      addMsg("Error: " + data.error, "assistant", null, latency);
-    } else {
+    const contentType = res.headers.get("Content-Type") || "";
+    if (!res.body || !contentType.includes("ndjson")) {
+      const data = await res.json();
+      setThinkingState(false);
+      const latency =
+        ((performance.now() - startTime) / 1000).toFixed(2) + "s";
       addMsg(
-        data.response || "No response.",
+        data.error ? "Error: " + data.error : data.response || "No response.",
         "assistant",
         data.poster_url,
         latency,
       );
+      return;
     }
+
+    await readChatStream(res, startTime);
   } catch (e) {
     setThinkingState(false);
     console.error("Chat Error:", e);
@@ -829,6 +829,123 @@ async function sendMessage() {
   }
 }
 
+async function readChatStream(res, startTime) {
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let streamed = "";
+  let live = null;
+  let firstTokenAt = null;
+
+  const handleEvent = (event) => {
+    if (event.type === "token") {
+      if (!live) {
+        setThinkingState(false);
+        firstTokenAt = performance.now();
+        live = addStreamingMsg();
+      }
+      streamed += event.text;
+      live.update(streamed);
+      return;
+    }
+
+    setThinkingState(false);
+    const endTime = performance.now();
+    const latency = ((endTime - startTime) / 1000).toFixed(2) + "s";
+    const ttft = firstTokenAt
+      ? ((firstTokenAt - startTime) / 1000).toFixed(2) + "s"
+      : null;
+
+    if (event.type === "error") {
+      if (live) live.finish("Error: " + event.error, latency, ttft);
+      else addMsg("Error: " + event.error, "assistant", null, latency);
+      return;
+    }
+
+    // "done" carries the validated answer, which may replace the draft
+    const finalText = event.response || "No response.";
+    if (live) live.finish(finalText, latency, ttft);
+    else addMsg(finalText, "assistant", event.poster_url, latency);
+  };
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split("\n");
+    buffer = lines.pop();
+
+    lines.filter((line) => line.trim()).forEach((line) => {
+      handleEvent(JSON.parse(line));
+    });
+  }
+
+  if (buffer.trim()) handleEvent(JSON.parse(buffer));
+}
+
+function addStreamingMsg() {
+  const container = document.getElementById("chat-container");
+  const rowDiv = document.createElement("div");
+  rowDiv.className = "chat-row assistant";
+  rowDiv.innerHTML = `<div class="chat-avatar-container"><div class="ai-avatar-multiglow"></div><div class="ai-n-logo">N</div></div><div class="msg-column"><div class="chat-name-tag">Neon AI</div><div class="msg"></div></div>`;
+  container.appendChild(rowDiv);
+
+  const newLogo = rowDiv.querySelector(".ai-n-logo");
+  if (newLogo) apply3DIconEffect(newLogo);
+
+  const msgDiv = rowDiv.querySelector(".msg");
+  const column = rowDiv.querySelector(".msg-column");
+
+  const scrollDown = () =>
+    requestAnimationFrame(() => {
+      container.scrollTo({ top: container.scrollHeight, behavior: "smooth" });
+    });
+
+  return {
+    update(text) {
+      msgDiv.innerHTML = renderMessage(text);
+      scrollDown();
+    },
+    finish(text, latency, ttft) {
+      const { text: cleanText, posterUrl } = extractPoster(text);
+      msgDiv.innerHTML = renderMessage(cleanText);
+      if (posterUrl) {
+        msgDiv.innerHTML += `<br><img src="${posterUrl}" class="chat-poster" alt="Movie Poster" loading="lazy">`;
+      }
+      const meta = document.createElement("div");
+      meta.style.cssText =
+        "font-size: 0.7rem; opacity: 0.5; margin-top: 5px; text-align: right;";
+      meta.innerText = ttft ? `⚡ ${latency} (first token ${ttft})` : `⚡ ${latency}`;
+      column.appendChild(meta);
+      scrollDown();
+    },
+  };
+}
+
+// Posters go through the server's /poster/ proxy (cached, resized buckets)
+const POSTER_URL_REGEX =
+  /((?:https?:\/\/[^\s]+?|\/poster\/[^\s]+?)\.(jpg|jpeg|png|gif|webp)(\?[^\s]+)?)/i;
+
+function posterFromPath(posterPath, size = "full") {
+  return `/poster/${posterPath.replace(/^\//, "")}?size=${size}`;
+}
+
+function proxiedPoster(url, size = "full") {
+  if (!url || url === "null" || url === "undefined") return null;
+  const tmdb = url.match(/^https?:\/\/image\.tmdb\.org\/t\/p\/[^/]+\/([^/?\s]+)$/i);
+  return tmdb ? posterFromPath(tmdb[1], size) : url;
+}
+
+function extractPoster(text) {
+  const match = (text || "").match(POSTER_URL_REGEX);
+  if (!match) return { text, posterUrl: null };
+  return {
+    text: text.replace(match[0], "").trim(),
+    posterUrl: proxiedPoster(match[0]),
+  };
+}
+
 function renderMessage(text) {
   if (!text) return "";
 
@@ -888,13 +1005,9 @@ function addMsg(text, type, posterUrl = null, latency = null) {
   }
 
   if (!posterUrl) {
-    const urlRegex =
-      /(https?:\/\/[^\s]+?\.(jpg|jpeg|png|gif|webp)(\?[^\s]+)?)/i;
-    const match = text.match(urlRegex);
-    if (match) {
-      posterUrl = match[0];
-      text = text.replace(match[0], "").trim();
-    }
+    ({ text, posterUrl } = extractPoster(text));
+  } else {
+    posterUrl = proxiedPoster(posterUrl);
   }
 
   let cleanText = text;
@@ -1003,9 +1116,17 @@ async function uploadPDF() {
   try {
     const res = await fetch("/upload-pdf", { method: "POST", body: formData });
     const data = await res.json();
+
+    if (data.status !== "queued") {
+      setThinkingState(false);
+      addMsg("Error: " + data.message, "assistant");
+      return;
+    }
+
+    const job = await pollIngestJob(data.job_id);
     setThinkingState(false);
     addMsg(
-      data.status === "success" ? "PDF Indexed!" : "Error: " + data.message,
+      job.status === "done" ? "PDF Indexed!" : "Error: " + job.message,
       "assistant",
     );
   } catch (e) {
@@ -1013,6 +1134,25 @@ async function uploadPDF() {
   }
 }
 
+async function pollIngestJob(jobId) {
+  const fileNameDisplay = document.getElementById("fileNameDisplay");
+
+  while (true) {
+    await new Promise((resolve) => setTimeout(resolve, 1000));
+    const res = await fetch(`/ingest-status/${jobId}`);
+    const job = await res.json();
+
+    if (job.status === "done" || job.status === "error" || !job.id) {
+      return job;
+    }
+
+    if (fileNameDisplay) {
+      const eta = job.eta_seconds != null ? ` · ~${Math.ceil(job.eta_seconds)}s` : "";
+      fileNameDisplay.innerText = `Page ${job.pages_parsed}/${job.pages_total || "?"} · ${job.chunks_embedded} embedded${eta}`;
+    }
+  }
+}
+
 async function deletePDF() {
   const res = await fetch("/delete-pdf", { method: "POST" });
   const data = await res.json();
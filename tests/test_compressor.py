@@ -0,0 +1,29 @@
+import random
+
+import pytest
+
+from exam import compressor
+
+
+WORDS = ["entropy", "heat", "engine", "cycle", "pressure", "volume", "work", "gas",
+         "carnot", "efficiency", "reservoir", "temperature", "isothermal", "adiabatic"]
+
+
+def _context(rng, chunks):
+    return compressor.CHUNK_SEPARATOR.join(
+        " ".join(
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 18))).capitalize() + "."
+            for _ in range(rng.randint(3, 8))
+        )
+        for _ in range(chunks)
+    )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_output_stays_within_budget(seed):
+    rng = random.Random(seed)
+    context = _context(rng, chunks=rng.randint(2, 5))
+
+    compressed = compressor.compress_context("carnot engine efficiency", context, budget=120)
+
+    assert compressor.estimate_tokens(compressed) <= 120
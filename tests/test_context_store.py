@@ -0,0 +1,36 @@
+import pytest
+
+from models import context_store, local_llm
+
+
+@pytest.fixture(autouse=True)
+def clean_store():
+    context_store.invalidate()
+    yield
+    context_store.invalidate()
+
+
+def test_reuse_resumes_after_full_rebuild():
+    # The server keeps the last 10 messages; every fourth turn overflows
+    # the context and forces a rebuild
+    window, reused = [], []
+
+    for turn in range(14):
+        history = window[-10:]
+        _, kv_context, turns = local_llm._prepare_prompt(f"q{turn}", "casual", None, history, "test")
+        reused.append(kv_context is not None)
+
+        size = context_store.MAX_CONTEXT_TOKENS + 1 if turn % 4 == 3 else 8
+        local_llm._remember_context("test", "casual", turns, [0] * size)
+        window += [{"role": "user", "content": f"q{turn}"}, {"role": "assistant", "content": f"a{turn}"}]
+
+    assert reused == [turn > 0 and turn % 4 != 0 for turn in range(14)]
+
+
+def test_discarded_context_is_not_reused():
+    history = [{"role": "user", "content": "q0"}, {"role": "assistant", "content": "a0"}]
+    local_llm._remember_context("test", "movie", ["q0"], [1, 2, 3])
+    assert context_store.get_context("test", "movie", history)
+
+    local_llm.discard_context("movie", session_id="test")
+    assert context_store.get_context("test", "movie", history) is None
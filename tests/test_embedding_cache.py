@@ -0,0 +1,27 @@
+from exam import embedding_cache
+from exam.embedding_cache import EmbeddingCache
+
+
+def test_reads_do_not_write(tmp_path):
+    cache = EmbeddingCache(path=str(tmp_path / "cache.sqlite3"))
+    cache.put_many("m", ["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+    conn = cache._connection()
+    changes = conn.total_changes
+
+    for _ in range(10):
+        assert cache.get_many("m", ["a", "b", "c"]) == {0: [1.0, 0.0], 1: [0.0, 1.0]}
+
+    assert conn.total_changes == changes
+
+
+def test_hits_are_flushed_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "TOUCH_BATCH", 2)
+    cache = EmbeddingCache(path=str(tmp_path / "cache.sqlite3"))
+    cache.put_many("m", ["a", "b"], [[1.0], [2.0]])
+    conn = cache._connection()
+    before = dict(conn.execute("SELECT key, last_used FROM embeddings"))
+
+    cache.get_many("m", ["a", "b"])
+
+    after = dict(conn.execute("SELECT key, last_used FROM embeddings"))
+    assert all(after[key] > before[key] for key in before)
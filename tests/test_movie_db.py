@@ -0,0 +1,39 @@
+import pytest
+
+from utils import movie_db
+
+
+TITLES = ["Hey", "GOAT", "Iron Man 2", "The Housemaid", "The Dark Knight", "Marty Supreme"]
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(movie_db, "DB_PATH", str(tmp_path / "movies.db"))
+    movie_db.save_movies_to_db([
+        {"title": title, "rating": "7", "plot": "Plot.", "poster": "", "cast": "Someone"}
+        for title in TITLES
+    ])
+    if not movie_db.FTS_ENABLED:
+        pytest.skip("SQLite build has no FTS5")
+    return movie_db
+
+
+def _title(db, query):
+    entry = db.get_movie_entry(query)
+    return entry[0]["title"] if entry else None
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("hey", "Hey"),
+    ("hey, tell me about interstellar", None),
+    ("is the goat of football messi", None),
+    ("tell me about the housemaid 2", None),
+    ("iron man", None),
+    ("tell me about the housemaid", "The Housemaid"),
+    ("tell me about the dark knight please", "The Dark Knight"),
+    ("dark knight", "The Dark Knight"),
+    ("iron man 2 cast", "Iron Man 2"),
+    ("is marty supreme good", "Marty Supreme"),
+])
+def test_title_lookup(db, query, expected):
+    assert _title(db, query) == expected
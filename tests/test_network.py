@@ -0,0 +1,32 @@
+from utils.network import ConnectivityMonitor
+
+
+SERVICES = {"tmdb": ("api.themoviedb.org", 443), "tavily": ("api.tavily.com", 443)}
+
+
+def test_unprobed_services_count_as_reachable():
+    monitor = ConnectivityMonitor(services=SERVICES, prober=lambda host, port, timeout: False)
+
+    assert monitor.is_reachable(["tmdb"])
+    assert not monitor.is_reachable(["unknown-service"])
+
+
+def test_probe_results_replace_the_assumption():
+    up = {"api.themoviedb.org": False, "api.tavily.com": True}
+    monitor = ConnectivityMonitor(services=SERVICES, prober=lambda host, port, timeout: up[host])
+
+    monitor.probe_once(now=0)
+
+    assert not monitor.is_reachable(["tmdb"])
+    assert monitor.is_reachable(["tmdb", "tavily"])
+
+
+def test_failed_service_backs_off():
+    monitor = ConnectivityMonitor(services={"tmdb": SERVICES["tmdb"]},
+                                  prober=lambda host, port, timeout: False,
+                                  retry_delay=5, max_backoff=20)
+
+    assert monitor.probe_once(now=0) == 5
+    assert monitor.probe_once(now=5) == 10
+    assert monitor.probe_once(now=15) == 20
+    assert monitor.probe_once(now=35) == 20
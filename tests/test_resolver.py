@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from movie import resolver, title_matcher
+from utils import movie_db, network
+from web import movie_adapter
+
+
+def _movie(title):
+    return {"title": title, "rating": "7", "plot": "Plot.", "poster": "", "cast": "Someone"}
+
+
+@pytest.fixture
+def stale_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(movie_db, "DB_PATH", str(tmp_path / "movies.db"))
+    monkeypatch.setattr(network, "is_internet_allowed", lambda mode="casual", silent=False: True)
+    monkeypatch.setattr(title_matcher, "add_title", lambda title: None)
+
+    movie_db.save_movie_to_db(_movie("Hey"))
+    old = time.time() - (movie_db.CACHE_DAYS + 1) * 24 * 3600
+    movie_db._WRITER.submit(lambda cursor: cursor.execute("UPDATE movies SET timestamp = ?", (old,)))
+    return movie_db
+
+
+def _wait_for_refreshes():
+    deadline = time.time() + 5
+    while resolver._IN_FLIGHT and time.time() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("answer", [
+    (movie_adapter.FOUND, _movie("Hey Arnold!")),
+    (movie_adapter.MISSING, None),
+])
+def test_stale_row_is_refreshed_once(stale_db, monkeypatch, answer):
+    lookups = []
+    monkeypatch.setattr(movie_adapter, "lookup_online_movie", lambda query: lookups.append(query) or answer)
+
+    for _ in range(3):
+        assert resolver.resolve("Hey")["title"] == "Hey"
+        _wait_for_refreshes()
+
+    assert lookups == ["Hey"]
+    assert stale_db.get_movie_entry("Hey")[1] is False
+
+
+def test_stale_row_stays_stale_after_network_error(stale_db, monkeypatch):
+    monkeypatch.setattr(movie_adapter, "lookup_online_movie", lambda query: (movie_adapter.ERROR, None))
+
+    resolver.resolve("Hey")
+    _wait_for_refreshes()
+
+    assert stale_db.get_movie_entry("Hey")[1] is True
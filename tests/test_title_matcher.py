@@ -0,0 +1,45 @@
+import pytest
+
+from movie.title_matcher import TitleMatcher
+
+
+CATALOGUE = [
+    "Hey", "GOAT", "GG", "It", "Up", "Iron Man 2", "The Housemaid", "Interstellar",
+    "The Dark Knight Rises", "Marty Supreme", "Crime 101",
+]
+
+
+@pytest.fixture
+def matcher():
+    return TitleMatcher(titles=CATALOGUE)
+
+
+@pytest.mark.parametrize("message, expected", [
+    # Short or common-word titles must be most of the message
+    ("hey, tell me about interstellar", "Interstellar"),
+    ("is the goat of football messi", None),
+    ("hey", "Hey"),
+    ("tell me about goat", "GOAT"),
+    # Numbers tell sequels apart
+    ("tell me about iron man 3", None),
+    ("iron man", None),
+    ("tell me about iron man 2", "Iron Man 2"),
+    ("tell me about the housemaid 2", None),
+    ("tell me about the housemaid", "The Housemaid"),
+    # Longer titles still match inside a sentence, typos still match
+    ("i watched the dark knight rises yesterday with my brother", "The Dark Knight Rises"),
+    ("tell me about the dark knigt rises", "The Dark Knight Rises"),
+    ("intersteller plot please", "Interstellar"),
+    ("crime 101 rating", "Crime 101"),
+    # Filler-only titles only as the whole request
+    ("it", "It"),
+    ("what do you know about it", None),
+])
+def test_extract(matcher, message, expected):
+    assert matcher.extract(message) == expected
+
+
+def test_unknown_title_is_not_replaced_by_a_short_one():
+    matcher = TitleMatcher(titles=["Hey", "GOAT"])
+    assert matcher.extract("hey, tell me about interstellar") is None
+    assert matcher.extract("hey") == "Hey"
@@ -1,67 +1,397 @@
 import sqlite3
 import time
 import os
+import re
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
 
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "neon_movies.db")
-CACHE_DAYS = 7
-
-
-def _get_connection():
+CACHE_DAYS = 7              # After this a row is stale: served, but refreshed
+NEGATIVE_CACHE_HOURS = 12   # How long a TMDB "no such movie" is remembered
+FTS_CANDIDATES = 20   # Ranked title matches checked per lookup
+TITLE_COVERAGE = 0.5  # Share of the message's meaningful words a title found inside it must cover
+
+# Words never worth matching a title on by themselves
+TITLE_STOPWORDS = {
+    "a", "an", "the", "of", "and", "or", "in", "on", "to", "for", "is",
+    "me", "about", "tell", "movie", "film", "please", "what", "who", "how"
+}
+
+# Title words that tell sequels apart ("Iron Man 2" vs "Iron Man")
+SEQUEL_NUMBER = re.compile(r"^(\d+|ii|iii|iv|v|vi|vii|viii|ix|x)$")
+
+# Set by init_db(); False when this SQLite build has no FTS5
+FTS_ENABLED = False
+
+# --- CONNECTION SETTINGS ---
+MMAP_SIZE = 64 * 1024 * 1024   # Bytes of the file memory-mapped for reads
+CACHE_SIZE_KB = 8192           # Page cache per connection
+CACHED_STATEMENTS = 64         # Prepared statements kept per connection
+POOL_SIZE = 8                  # Read connections kept open and shared by request threads
+WRITE_BATCH = 64               # Queued writes committed in one transaction
+WRITE_TIMEOUT = 10             # Seconds a caller waits for its write
+
+_POOLS = {}                    # DB path -> _ConnectionPool
+_POOLS_LOCK = threading.Lock()
+_INIT_LOCK = threading.Lock()
+_INITIALIZED = set()           # DB paths whose schema is ready
+
+
+# -----------------------------
+# Connections
+# -----------------------------
+
+def _open_connection(path):
     """
-    Returns a safe SQLite connection with performance settings.
+    Opens a connection with performance settings. Autocommit mode:
+    the writer thread manages its own transactions. Not bound to the
+    opening thread, so pooled connections can serve any request.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(
+        path,
+        timeout=WRITE_TIMEOUT,
+        isolation_level=None,
+        cached_statements=CACHED_STATEMENTS,
+        check_same_thread=False
+    )
     conn.execute("PRAGMA journal_mode=WAL;")
     conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE};")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB};")
+    conn.execute("PRAGMA temp_store=MEMORY;")
     return conn
 
 
-def init_db():
-    """Initializes the database table if it doesn't exist."""
-    conn = _get_connection()
-    cursor = conn.cursor()
+class _ConnectionPool:
+    """
+    Up to `size` open connections to one database file, checked out per
+    call. Request threads come and go (one per request under the threaded
+    dev server), connections stay: PRAGMAs run once per connection and
+    prepared statements are reused across requests.
+    """
 
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS movies (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT UNIQUE COLLATE NOCASE,
-            rating TEXT,
-            plot TEXT,
-            poster TEXT,
-            cast TEXT,
-            timestamp REAL
-        )
-    ''')
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+
+        if not can_open:
+            return self._idle.get(timeout=WRITE_TIMEOUT)
+
+        try:
+            return _open_connection(self.path)
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+
+def _connection():
+    """
+    Checks out a pooled connection to DB_PATH (use as a context manager).
+    The schema is created on first use.
+    """
+    path = DB_PATH
+    pool = _POOLS.get(path)
 
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_title ON movies(title);")
+    if pool is None:
+        if path not in _INITIALIZED:
+            init_db()
+        with _POOLS_LOCK:
+            pool = _POOLS.setdefault(path, _ConnectionPool(path, POOL_SIZE))
 
-    conn.commit()
-    conn.close()
+    return pool.connection()
 
 
-def get_movie_from_db(query):
+class _Writer:
     """
-    Retrieves movie from DB.
-    Returns None if cache expired or not found.
+    Single thread that owns every write. Jobs queued by request threads
+    are committed together (up to WRITE_BATCH per transaction), so
+    concurrent saves never race for the lock ("database is locked").
+    Each job runs in its own savepoint: one failing job does not undo
+    the others in its batch.
     """
 
-    if not query:
-        return None
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._conn = None
+        self._path = None
+
+    def submit(self, job, wait=True):
+        """Queues job(cursor); returns its result when wait=True."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="movie-db-writer", daemon=True)
+                self._thread.start()
+
+        future = Future()
+        self._queue.put((job, future))
+        return future.result(timeout=WRITE_TIMEOUT) if wait else future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < WRITE_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._commit(batch)
+
+    def _get_connection(self):
+        """The writer's own connection, reopened if DB_PATH changes."""
+        if self._conn is not None and self._path == DB_PATH:
+            return self._conn
+
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+        if DB_PATH not in _INITIALIZED:
+            init_db()
+
+        self._conn, self._path = _open_connection(DB_PATH), DB_PATH
+        return self._conn
+
+    def _commit(self, batch):
+        outcomes = []
+        conn = None
+
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+
+            for job, future in batch:
+                cursor.execute("SAVEPOINT job")
+                try:
+                    outcomes.append((future, job(cursor), None))
+                    cursor.execute("RELEASE job")
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO job")
+                    cursor.execute("RELEASE job")
+                    outcomes.append((future, None, e))
+
+            cursor.execute("COMMIT")
+
+        except Exception as e:
+            try:
+                conn.execute("ROLLBACK")
+            except Exception:
+                pass
+            outcomes = [(future, None, e) for _, future in batch]
+
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+_WRITER = _Writer()
 
-    try:
-        conn = _get_connection()
+
+def init_db():
+    """Initializes the database tables if they don't exist (run on first use)."""
+    with _INIT_LOCK:
+        conn = _open_connection(DB_PATH)
         cursor = conn.cursor()
+        cursor.execute("BEGIN")
 
-        cursor.execute(
-            "SELECT title, rating, plot, poster, cast, timestamp "
-            "FROM movies WHERE title LIKE ? COLLATE NOCASE LIMIT 1",
-            ('%' + query.strip() + '%',)
-        )
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS movies (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT UNIQUE COLLATE NOCASE,
+                rating TEXT,
+                plot TEXT,
+                poster TEXT,
+                cast TEXT,
+                timestamp REAL
+            )
+        ''')
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_title ON movies(title);")
 
-        row = cursor.fetchone()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS movie_misses (
+                query TEXT PRIMARY KEY COLLATE NOCASE,
+                timestamp REAL
+            )
+        ''')
+
+        _init_fts(cursor)
+
+        cursor.execute("COMMIT")
         conn.close()
+        _INITIALIZED.add(DB_PATH)
+
+
+def _init_fts(cursor):
+    """
+    Full-text index over titles (external content table kept in sync by
+    triggers). Built from existing rows the first time it is created.
+    """
+    global FTS_ENABLED
+
+    try:
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='movies_fts'"
+        ).fetchone()
+
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+                title,
+                content='movies',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS movies_fts_ai AFTER INSERT ON movies BEGIN
+                INSERT INTO movies_fts(rowid, title) VALUES (new.id, new.title);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS movies_fts_ad AFTER DELETE ON movies BEGIN
+                INSERT INTO movies_fts(movies_fts, rowid, title) VALUES ('delete', old.id, old.title);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS movies_fts_au AFTER UPDATE OF title ON movies BEGIN
+                INSERT INTO movies_fts(movies_fts, rowid, title) VALUES ('delete', old.id, old.title);
+                INSERT INTO movies_fts(rowid, title) VALUES (new.id, new.title);
+            END
+        ''')
+
+        if not exists:
+            cursor.execute("INSERT INTO movies_fts(movies_fts) VALUES ('rebuild')")
+            print("[Database] Built title search index.")
+
+        FTS_ENABLED = True
+
+    except sqlite3.OperationalError as e:
+        # SQLite compiled without FTS5: fall back to LIKE lookups
+        FTS_ENABLED = False
+        print(f"[Database] Title search index unavailable: {e}")
+
+
+def _title_tokens(text):
+    return re.findall(r"\w+", (text or "").lower())
+
+
+def _search_titles_fts(cursor, query):
+    """
+    Ranked OR-match of the message words against titles. Prefers the
+    longest title whose words all appear in the message ("tell me about
+    the dark knight" -> "The Dark Knight") if it covers most of the
+    message's meaningful words, then a title containing every meaningful
+    word of the message ("dark knight" -> "The Dark Knight") but no
+    sequel number the message lacks.
+    """
+    message_tokens = _title_tokens(query)
+    terms = [t for t in dict.fromkeys(message_tokens) if t not in TITLE_STOPWORDS]
+    if not terms:
+        return None
+
+    match = " OR ".join(f'"{t}"' for t in terms)
+    rows = cursor.execute(
+        "SELECT m.title, m.rating, m.plot, m.poster, m.\"cast\", m.timestamp "
+        "FROM movies_fts JOIN movies m ON m.id = movies_fts.rowid "
+        "WHERE movies_fts MATCH ? ORDER BY bm25(movies_fts) LIMIT ?",
+        (match, FTS_CANDIDATES)
+    ).fetchall()
+
+    message_set = set(message_tokens)
+    terms_set = set(terms)
+    best = None
+    best_length = 0
+
+    for row in rows:
+        title_tokens = _title_tokens(row[0])
+        if not title_tokens or not set(title_tokens) <= message_set or len(title_tokens) <= best_length:
+            continue
+
+        # A short title inside a longer message ("hey, tell me about ...")
+        # is only a match if it is most of what was asked
+        if len(terms_set & set(title_tokens)) > TITLE_COVERAGE * len(terms_set):
+            best, best_length = row, len(title_tokens)
+
+    if best:
+        return best
+
+    for row in rows:
+        title_set = set(_title_tokens(row[0]))
+        extra_numbers = [t for t in title_set - terms_set if SEQUEL_NUMBER.match(t)]
+        if terms_set <= title_set and not extra_numbers:
+            return row
+
+    return None
+
+
+def _find_movie_row(cursor, query):
+    """Exact title first, then the full-text index (or LIKE without FTS5)."""
+    query = query.strip()
+
+    row = cursor.execute(
+        "SELECT title, rating, plot, poster, \"cast\", timestamp "
+        "FROM movies WHERE title = ? COLLATE NOCASE LIMIT 1",
+        (query,)
+    ).fetchone()
+    if row:
+        return row
+
+    if FTS_ENABLED:
+        return _search_titles_fts(cursor, query)
+
+    return cursor.execute(
+        "SELECT title, rating, plot, poster, \"cast\", timestamp "
+        "FROM movies WHERE title LIKE ? COLLATE NOCASE LIMIT 1",
+        ('%' + query + '%',)
+    ).fetchone()
+
+
+def get_movie_entry(query):
+    """
+    Retrieves movie from DB by title or by a chat message naming it.
+    Returns (movie, is_stale), or None if not found. Stale rows (older
+    than CACHE_DAYS) are still returned so callers can serve them while
+    refreshing.
+    """
+
+    if not query:
+        return None
+
+    try:
+        with _connection() as conn:
+            row = _find_movie_row(conn.cursor(), query)
 
         if not row:
             return None
@@ -71,23 +401,112 @@ def get_movie_from_db(query):
         current_time = time.time()
         days_diff = (current_time - saved_time) / (24 * 3600)
 
-        if days_diff > CACHE_DAYS:
-            print(f"[Database] Cache expired for '{title}'.")
-            return None
-
-        return {
+        movie = {
             "title": title,
             "rating": rating,
             "plot": plot,
             "poster": poster,
             "cast": cast
         }
+        return movie, days_diff > CACHE_DAYS
 
     except Exception as e:
         print(f"[Database] Read error: {e}")
         return None
 
 
+def get_movie_from_db(query):
+    """
+    Retrieves movie from DB by title or by a chat message naming it.
+    Returns None if cache expired or not found.
+    """
+    entry = get_movie_entry(query)
+    if not entry:
+        return None
+
+    movie, is_stale = entry
+    if is_stale:
+        print(f"[Database] Cache expired for '{movie['title']}'.")
+        return None
+
+    return movie
+
+
+# -----------------------------
+# Negative Cache (TMDB misses)
+# -----------------------------
+
+def is_known_miss(query):
+    """True if TMDB recently had no movie for this query."""
+    if not query:
+        return False
+
+    try:
+        with _connection() as conn:
+            row = conn.execute(
+                "SELECT timestamp FROM movie_misses WHERE query = ?",
+                (query.strip(),)
+            ).fetchone()
+
+        return bool(row) and time.time() - row[0] < NEGATIVE_CACHE_HOURS * 3600
+
+    except Exception as e:
+        print(f"[Database] Read error: {e}")
+        return False
+
+
+def save_miss(query):
+    """Remembers that TMDB has no movie for this query."""
+    if not query:
+        return
+
+    try:
+        _WRITER.submit(lambda cursor: cursor.execute(
+            "INSERT OR REPLACE INTO movie_misses (query, timestamp) VALUES (?, ?)",
+            (query.strip(), time.time())
+        ))
+
+    except Exception as e:
+        print(f"[Database] Save error: {e}")
+
+
+def get_all_titles():
+    """Every cached title (used to build the chat title matcher)."""
+    try:
+        with _connection() as conn:
+            return [row[0] for row in conn.execute("SELECT title FROM movies")]
+
+    except Exception as e:
+        print(f"[Database] Read error: {e}")
+        return []
+
+
+REQUIRED_FIELDS = ["title", "rating", "plot", "poster", "cast"]
+
+
+def _upsert_movie(cursor, data, saved_time):
+    cursor.execute('''
+        INSERT INTO movies (title, rating, plot, poster, cast, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(title) DO UPDATE SET
+            rating=excluded.rating,
+            plot=excluded.plot,
+            poster=excluded.poster,
+            cast=excluded.cast,
+            timestamp=excluded.timestamp
+    ''', (
+        data["title"],
+        data["rating"],
+        data["plot"],
+        data["poster"],
+        data["cast"],
+        saved_time
+    ))
+
+    # A movie found under this title is no longer a miss
+    cursor.execute("DELETE FROM movie_misses WHERE query = ?", (data["title"],))
+
+
 def save_movie_to_db(data):
     """
     Saves or updates movie data with current timestamp.
@@ -96,44 +515,66 @@ def save_movie_to_db(data):
     if not isinstance(data, dict):
         return
 
-    required_fields = ["title", "rating", "plot", "poster", "cast"]
-
-    if not all(field in data for field in required_fields):
+    if not all(field in data for field in REQUIRED_FIELDS):
         print("[Database] Invalid movie data format.")
         return
 
     try:
-        conn = _get_connection()
-        cursor = conn.cursor()
+        _WRITER.submit(lambda cursor: _upsert_movie(cursor, data, time.time()))
 
-        current_time = time.time()
+        print(f"[Database] Saved or updated: {data['title']}")
 
-        cursor.execute('''
-            INSERT INTO movies (title, rating, plot, poster, cast, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(title) DO UPDATE SET
-                rating=excluded.rating,
-                plot=excluded.plot,
-                poster=excluded.poster,
-                cast=excluded.cast,
-                timestamp=excluded.timestamp
-        ''', (
-            data["title"],
-            data["rating"],
-            data["plot"],
-            data["poster"],
-            data["cast"],
-            current_time
-        ))
+    except Exception as e:
+        print(f"[Database] Save error: {e}")
 
-        conn.commit()
-        conn.close()
 
-        print(f"[Database] Saved or updated: {data['title']}")
+def touch_movie(title):
+    """
+    Re-dates a cached row without changing it, e.g. after a refresh
+    that found nothing newer for it.
+    """
+    if not title:
+        return
+
+    try:
+        _WRITER.submit(lambda cursor: cursor.execute(
+            "UPDATE movies SET timestamp = ? WHERE title = ? COLLATE NOCASE",
+            (time.time(), title)
+        ))
 
     except Exception as e:
         print(f"[Database] Save error: {e}")
 
 
-# Initialize table on import
-init_db()
+def save_movies_to_db(movies, misses=()):
+    """
+    Saves many movies (and TMDB misses) in a single transaction.
+    Returns the number of movies written, or None if the write failed.
+    """
+    valid = [
+        m for m in movies
+        if isinstance(m, dict) and all(field in m for field in REQUIRED_FIELDS)
+    ]
+    misses = [q.strip() for q in misses if q]
+
+    if not valid and not misses:
+        return 0
+
+    def write(cursor):
+        now = time.time()
+        for movie in valid:
+            _upsert_movie(cursor, movie, now)
+        for query in misses:
+            cursor.execute(
+                "INSERT OR REPLACE INTO movie_misses (query, timestamp) VALUES (?, ?)",
+                (query, now)
+            )
+
+    try:
+        _WRITER.submit(write)
+        print(f"[Database] Saved {len(valid)} movies, {len(misses)} misses.")
+        return len(valid)
+
+    except Exception as e:
+        print(f"[Database] Save error: {e}")
+        return None
@@ -1,5 +1,6 @@
 import socket
-import requests
+import threading
+import time
 
 
 ALLOWED_ONLINE_MODES = {"casual", "movie", "coding"}
@@ -10,6 +11,32 @@ def is_physically_connected(host="8.8.8.8", port=53, timeout=2):
     """
     Checks low-level internet connectivity using DNS socket.
     """
+    return tcp_probe(host, port, timeout)
+
+
+# -----------------------------
+# Service Reachability
+# -----------------------------
+
+# Hosts the online features actually talk to
+SERVICE_HOSTS = {
+    "tmdb": ("api.themoviedb.org", 443),
+    "tavily": ("api.tavily.com", 443),
+    "duckduckgo": ("duckduckgo.com", 443),
+}
+
+SEARCH_SERVICES = ("tavily", "duckduckgo")
+
+# Services that must be reachable (any of) for a mode to go online
+MODE_SERVICES = {
+    "casual": SEARCH_SERVICES,
+    "coding": SEARCH_SERVICES,
+    "movie": ("tmdb",),
+}
+
+
+def tcp_probe(host, port, timeout=2):
+    """Default prober: can a TCP connection be opened to host:port?"""
     try:
         with socket.create_connection((host, port), timeout=timeout):
             return True
@@ -17,25 +44,120 @@ def is_physically_connected(host="8.8.8.8", port=53, timeout=2):
         return False
 
 
-def _http_check(timeout=2):
-    """
-    Secondary HTTP check to confirm actual internet access.
+class ConnectivityMonitor:
     """
-    try:
-        requests.get("https://www.google.com", timeout=timeout)
-        return True
-    except requests.RequestException:
-        return False
+    Background reachability tracker.
 
+    A daemon thread probes each service on `interval`; an unreachable
+    service is retried with exponential backoff (retry_delay doubling up
+    to max_backoff). Readers only look at the cached state, so checks
+    cost O(1) and never touch the network. A service that has not been
+    probed yet counts as reachable, so requests arriving right after
+    startup are not sent offline while the first probe runs.
+
+    `prober(host, port, timeout) -> bool` is injectable, which keeps the
+    monitor testable without a real network.
+    """
 
-def is_internet_allowed(mode="casual", silent=False):
+    def __init__(self, services=None, prober=None, interval=30,
+                 retry_delay=5, max_backoff=120, timeout=2):
+        self.services = dict(services or SERVICE_HOSTS)
+        self.prober = prober or tcp_probe
+        self.interval = interval
+        self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+
+        self._state = {name: None for name in self.services}   # None = not probed yet
+        self._backoff = {name: retry_delay for name in self.services}
+        self._next_check = {name: 0.0 for name in self.services}
+
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def probe_once(self, now=None):
+        """
+        Probes every service that is due and updates its state.
+        Returns seconds until the next service is due.
+        """
+        now = time.monotonic() if now is None else now
+
+        for name, (host, port) in self.services.items():
+            if now < self._next_check[name]:
+                continue
+
+            ok = bool(self.prober(host, port, self.timeout))
+
+            with self._lock:
+                self._state[name] = ok
+
+                if ok:
+                    self._backoff[name] = self.retry_delay
+                    delay = self.interval
+                else:
+                    delay = self._backoff[name]
+                    self._backoff[name] = min(delay * 2, self.max_backoff)
+
+                self._next_check[name] = now + delay
+
+        self._ready.set()
+
+        return max(0.0, min(self._next_check.values()) - now)
+
+    def _run(self):
+        while not self._stop.is_set():
+            wait = self.probe_once()
+            self._stop.wait(wait)
+
+    def start(self, wait_ready=False):
+        """
+        Starts the probe thread (idempotent). wait_ready=True blocks until
+        the first probe round has finished.
+        """
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="net-monitor", daemon=True)
+            self._thread.start()
+
+        if wait_ready:
+            self._ready.wait(self.timeout * len(self.services) + 1)
+
+    def stop(self):
+        self._stop.set()
+
+    def is_reachable(self, services):
+        """
+        True if any of the given services was reachable on its last probe
+        or has not been probed yet.
+        """
+        with self._lock:
+            return any(
+                name in self._state and self._state[name] is not False
+                for name in services
+            )
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._state)
+
+
+MONITOR = ConnectivityMonitor()
+
+
+def is_internet_allowed(mode="casual", silent=False, services=None):
     """
     Network Policy Manager.
 
     Rules:
     - Exam mode: Always offline.
-    - Casual, Movie, Coding: Allowed if physically connected.
+    - Casual, Movie, Coding: Allowed if a service they use is reachable.
     - Unknown modes: Blocked by default.
+
+    Reachability comes from the background monitor's cached state.
     """
 
     mode = (mode or "").lower().strip()
@@ -57,17 +179,15 @@ def is_internet_allowed(mode="casual", silent=False):
         return False
 
     # -----------------------------
-    # Physical Connectivity Check
+    # Cached Reachability Check
     # -----------------------------
-    if not is_physically_connected():
-        if not silent:
-            print("[Network] Physical internet unavailable.")
-        return False
+    MONITOR.start()
+
+    services = services or MODE_SERVICES.get(mode, SEARCH_SERVICES)
 
-    # Optional deeper HTTP validation
-    if not _http_check():
+    if not MONITOR.is_reachable(services):
         if not silent:
-            print("[Network] HTTP validation failed.")
+            print(f"[Network] Unreachable: {', '.join(services)}.")
         return False
 
     if not silent:
@@ -0,0 +1,173 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# --- CONFIGURATION ---
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(CURRENT_DIR, "posters")
+IMAGE_BASE = "https://image.tmdb.org/t/p"
+SIZES = {"thumb": "w185", "full": "w500"}   # bucket -> TMDB image size
+MAX_BYTES = 200 * 1024 * 1024               # Disk budget for all buckets
+MAX_AGE = 365 * 24 * 3600                   # TMDB poster paths are immutable
+
+# TMDB poster file names, e.g. "qJ2tW6WMUDux911r6m7haRef0WH.jpg"
+POSTER_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}\.(jpg|jpeg|png|webp)$")
+
+
+class PosterCache:
+    """
+    On-disk poster cache in size buckets (thumb/full), bounded by total
+    bytes with least-recently-used eviction.
+
+    Each poster is fetched from TMDB once per bucket; concurrent requests
+    for the same poster wait on that one download. Cached posters keep
+    working when the uplink is slow or down.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_BYTES, image_base=IMAGE_BASE, timeout=(3, 10)):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.image_base = image_base.rstrip("/")
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._index = OrderedDict()   # (bucket, poster_id) -> bytes, oldest first
+        self._total = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._fetch_locks = {}
+
+    @staticmethod
+    def etag(bucket, poster_id):
+        return f'"{bucket}-{poster_id}"'
+
+    def _path(self, bucket, poster_id):
+        return os.path.join(self.root, bucket, poster_id)
+
+    def _load(self):
+        """Rebuilds the LRU order from file mtimes (called under the lock)."""
+        if self._loaded:
+            return
+
+        entries = []
+        for bucket in SIZES:
+            folder = os.path.join(self.root, bucket)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if not POSTER_ID.match(name):
+                    continue
+                stat = os.stat(os.path.join(folder, name))
+                entries.append((stat.st_mtime, (bucket, name), stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total += size
+
+        self._loaded = True
+
+    def _evict(self):
+        """Drops least recently used posters until under budget (under the lock)."""
+        while self._total > self.max_bytes and len(self._index) > 1:
+            (bucket, poster_id), size = self._index.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(self._path(bucket, poster_id))
+            except OSError:
+                pass
+
+    def _hit(self, key):
+        """Marks a cached poster as used; returns its path or None."""
+        with self._lock:
+            self._load()
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+
+        path = self._path(*key)
+        try:
+            os.utime(path)   # Keeps LRU order across restarts
+        except OSError:
+            with self._lock:
+                self._total -= self._index.pop(key, 0)
+            return None
+        return path
+
+    def _download(self, bucket, poster_id):
+        url = f"{self.image_base}/{SIZES[bucket]}/{poster_id}"
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"[Posters] Fetch failed for {poster_id}: {e}")
+            return None
+
+        if response.status_code != 200 or not response.content:
+            print(f"[Posters] HTTP {response.status_code} for {poster_id}.")
+            return None
+
+        path = self._path(bucket, poster_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(response.content)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            key = (bucket, poster_id)
+            self._total += len(response.content) - self._index.get(key, 0)
+            self._index[key] = len(response.content)
+            self._index.move_to_end(key)
+            self._evict()
+
+        return path
+
+    def get(self, poster_id, size="full"):
+        """
+        Returns (path, bucket) for a poster, downloading it on first use.
+        Falls back to the other bucket if this one cannot be fetched.
+        Returns None for invalid ids or when nothing can be served.
+        """
+        if not poster_id or not POSTER_ID.match(poster_id):
+            return None
+
+        bucket = size if size in SIZES else "full"
+        key = (bucket, poster_id)
+
+        path = self._hit(key)
+        if path:
+            return path, bucket
+
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(key, threading.Lock())
+
+        try:
+            with fetch_lock:
+                # Another request may have fetched it while we waited
+                path = self._hit(key) or self._download(bucket, poster_id)
+        finally:
+            with self._lock:
+                self._fetch_locks.pop(key, None)
+
+        if path:
+            return path, bucket
+
+        for other in SIZES:
+            if other != bucket:
+                path = self._hit((other, poster_id))
+                if path:
+                    return path, other
+
+        return None
+
+
+CACHE = PosterCache()
+
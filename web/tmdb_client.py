@@ -0,0 +1,188 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# lookup_movie() statuses
+FOUND = "found"
+MISSING = "missing"   # TMDB answered and has no such movie
+ERROR = "error"       # No key, network or server failure: worth retrying
+
+
+class TokenBucket:
+    """Blocking rate limiter: `rate` requests per second, bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class TMDBClient:
+    """
+    Keep-alive client for the TMDB v3 API.
+
+    - One pooled requests.Session shared by every call and worker thread.
+    - Client-side token bucket kept under TMDB's per-IP limit (~50 req/s).
+    - 429 responses wait for Retry-After; 5xx and connection errors retry
+      with exponential backoff.
+    - Query strings are encoded by requests (params=), never by hand.
+    - base_url is configurable, e.g. to run against a local fake server.
+    """
+
+    def __init__(self, base_url="https://api.themoviedb.org/3", api_key=None,
+                 poster_base="https://image.tmdb.org/t/p/w500", rate=40, burst=20,
+                 pool_size=16, timeout=(3, 8), max_retries=2, max_retry_after=10):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.poster_base = poster_base
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_retry_after = max_retry_after
+        self.bucket = TokenBucket(rate, burst)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    # -----------------------------
+    # HTTP
+    # -----------------------------
+
+    def _retry_after(self, response, attempt):
+        try:
+            delay = float(response.headers.get("Retry-After", ""))
+        except ValueError:
+            delay = 2 ** attempt
+        return min(max(delay, 0), self.max_retry_after)
+
+    def get(self, path, params=None):
+        """
+        Returns (status, json). status is FOUND on 200, MISSING on 404 and
+        ERROR once retries are exhausted or the key is missing/invalid.
+        """
+        if not self.api_key:
+            print("[TMDB] API key not set.")
+            return ERROR, None
+
+        params = dict(params or {}, api_key=self.api_key)
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+
+            try:
+                response = self.session.get(self.base_url + path, params=params, timeout=self.timeout)
+            except requests.RequestException as e:
+                if attempt == self.max_retries:
+                    print(f"[TMDB] Request failed: {e}")
+                    return ERROR, None
+                time.sleep(0.5 * 2 ** attempt)
+                continue
+
+            if response.status_code == 200:
+                try:
+                    return FOUND, response.json()
+                except ValueError:
+                    return ERROR, None
+
+            if response.status_code == 404:
+                return MISSING, None
+
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt == self.max_retries:
+                    break
+                delay = self._retry_after(response, attempt) if response.status_code == 429 \
+                    else 0.5 * 2 ** attempt
+                print(f"[TMDB] HTTP {response.status_code}, retrying in {delay:.1f}s.")
+                time.sleep(delay)
+                continue
+
+            print(f"[TMDB] HTTP {response.status_code} for {path}.")
+            return ERROR, None
+
+        return ERROR, None
+
+    # -----------------------------
+    # Movies
+    # -----------------------------
+
+    def _format_movie(self, movie, details):
+        title = movie.get("title", "Unknown")
+
+        vote = movie.get("vote_average")
+        rating = str(round(vote, 1)) if isinstance(vote, (int, float)) else "N/A"
+
+        plot = movie.get("overview") or "No description available."
+
+        release_date = movie.get("release_date", "")
+        year = release_date.split("-")[0] if release_date else "N/A"
+
+        poster_path = movie.get("poster_path")
+        full_poster = f"{self.poster_base}{poster_path}" if poster_path else ""
+
+        cast_data = details.get("credits", {}).get("cast", [])
+        cast_list = [actor.get("name") for actor in cast_data[:5] if actor.get("name")]
+        cast = ", ".join(cast_list) if cast_list else "Not available"
+
+        return {
+            "title": title,
+            "year": year,
+            "rating": rating,
+            "plot": plot,
+            "poster": full_poster,
+            "cast": cast
+        }
+
+    def lookup_movie(self, query):
+        """Top search result with details + credits: (status, movie)."""
+        status, search_data = self.get("/search/movie", {"query": query})
+        if status != FOUND:
+            return status, None
+
+        results = (search_data or {}).get("results")
+        if not results or not results[0].get("id"):
+            return MISSING, None
+
+        movie = results[0]
+        status, details = self.get(f"/movie/{movie['id']}", {"append_to_response": "credits"})
+        if status == MISSING:
+            # Search returned an id TMDB no longer serves
+            return MISSING, None
+        if status != FOUND:
+            return ERROR, None
+
+        return FOUND, self._format_movie(movie, details or {})
+
+    def bulk_lookup(self, queries, workers=8):
+        """
+        Resolves many titles concurrently (pooled connections, shared rate
+        limit). Returns {query: (status, movie)}.
+        """
+        queries = list(dict.fromkeys(q for q in queries if q))
+        if not queries:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(queries))),
+                                thread_name_prefix="tmdb") as executor:
+            return dict(zip(queries, executor.map(self.lookup_movie, queries)))